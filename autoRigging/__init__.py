@@ -0,0 +1,37 @@
+'''Maya biped auto rigger.
+
+Importing the package has no side effects and doesn't import Maya; the
+entry functions below load their module on first use.
+
+    import autoRigging
+    autoRigging.build_rig()                 # rig the selected character's body meshes
+    autoRigging.build_characters(meshes)    # rig every character among meshes
+    autoRigging.load_rig('bob.rig', 'Ann')  # rebuild a saved rig for another character
+    autoRigging.backend.use_fake()          # run against the in-memory scene
+'''
+import importlib
+
+from . import backend
+
+# Entry function -> module that defines it
+_ENTRY_POINTS = {
+    'build_rig': 'autoRigger',
+    'build_characters': 'autoRigger',
+    'RigError': 'autoRigger',
+    'RigPlan': 'rigPlan',
+    'SkeletonTemplate': 'skeletonTemplate',
+    'export_rig': 'rigFile',
+    'load_rig': 'rigFile',
+    'createJointAtMeshPivot': 'createJointsAtMeshPivot',
+    'locatorCreator': 'createLocator',
+    'createRigControllers': 'createRigControllers',
+    'parent_to_group': 'offsetGroup',
+    'run_batch': 'batchRig',
+}
+
+
+def __getattr__(name):
+    if name in _ENTRY_POINTS:
+        module = importlib.import_module('.' + _ENTRY_POINTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
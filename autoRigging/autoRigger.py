@@ -0,0 +1,448 @@
+import contextlib
+
+from .backend import cmds, mel
+from .rigPlan import character_plans
+from .skeletonTemplate import STOCK
+
+# Build options
+COMBINE_SKIN = False    # merge the geo_grp pieces into one mesh with a single skinCluster
+SKIN_FALLOFF = 0.0      # blend distance at part boundaries when COMBINE_SKIN is on
+MATRIX_RIG = False      # drive joints through matrix connections instead of constraints and offset groups
+JOINT_PLACEMENT = 'pivot'   # where joints go in each mesh: 'pivot', 'bbox' or 'centroid'
+INCREMENTAL = True      # re-running on a rigged character only rebuilds the parts that changed
+FAST_MODE = False       # suspend undo and viewport refresh during a build instead of one undo chunk
+SKELETON = STOCK        # skeletonTemplate the body parts come from: chain lengths of spine, fingers and twist
+MIRROR = False          # place the right side's joints by mirroring the left when both sides are symmetric
+LOD = None              # lod.LODS preset or role patterns of the parts to drop, for lighter crowd rigs
+
+class RigError(Exception):
+    '''Raised in place of a warning dialog when the rigger runs without a UI'''
+
+def warning_dialog(message, interactive=True):
+    '''Shows a warning dialog, or raises RigError when running without a UI'''
+    if not interactive:
+        raise RigError(message)
+    gMainWindow = mel.eval('$tmpVar=$gMainWindow')
+    cmds.confirmDialog(icn = 'warning', button = ('OK'),  dismissString='No', m = message, parent=gMainWindow)
+
+class SkelCreator:
+    '''Class for creating biped skeleton'''
+    def __init__(self, plan, interactive=True, placement=JOINT_PLACEMENT, mirror=None, parts=None):
+        self.plan = plan
+        self.interactive = interactive
+        self.placement = placement
+        self.mirror = mirror
+        self.parts = parts
+    def invalid_names(self):
+        '''Function which checks for invalid names that 
+        don't match the naming convention in the geometry names'''
+        invalid_meshes = self.plan.invalid
+        if invalid_meshes and not self.interactive:
+            print("Invalid Mesh Names:", invalid_meshes)
+        elif invalid_meshes:
+            gMainWindow = mel.eval('$tmpVar=$gMainWindow')
+            name_warning = cmds.confirmDialog(icn = 'warning', button = ('Confirm', 'Cancel'), defaultButton='Confirm', cancelButton='Cancel', dismissString='No', parent=gMainWindow, m = ("Object doesn't contain correct naming convention, or isn't part of the body mesh. Would you still like to continue? Joint for this mesh will not be created. See Script Editor for list of objects."))
+            print("Invalid Mesh Names:", invalid_meshes)
+            if name_warning == 'Cancel':
+                print('Operation Cancelled')
+                return True
+        return False
+    def create_skeleton(self):
+        '''Function which creates skeleton, returns True once it is built'''
+        plan = self.plan
+        geo_sel = plan.all_meshes
+        if not geo_sel:
+            warning_dialog("No mesh selected.", self.interactive)
+            return False
+        if not cmds.objExists(plan.geo_grp):
+            cmds.createNode('transform', name=plan.geo_grp, skipSelect=True)
+            cmds.parent(geo_sel, plan.geo_grp)
+        # Only this character's joints count, other characters may be rigged already
+        if cmds.ls(plan.all_joints(), type='joint'):
+            warning_dialog("Already pre-existing joints in the scene. Please remove these joints.", self.interactive)
+            return False
+        if self.invalid_names():
+            return False
+        if plan.missing:
+            print("Missing body parts, joined to the nearest part present instead:", plan.missing)
+
+        world = {}
+        for name, parent, position in self.joint_layout():
+            world[name] = position
+            if parent:
+                cmds.createNode('joint', name=name, parent=parent, skipSelect=True)
+                translate = [a - b for a, b in zip(position, world[parent])]
+            else:
+                cmds.createNode('joint', name=name, skipSelect=True)
+                translate = position
+            cmds.setAttr(name + '.translate', *[float(value) for value in translate])
+            cmds.setAttr(name + '.radius', 3)
+        return True
+
+    def joint_layout(self):
+        '''World position of every joint, as (joint, parent, position).
+
+            placement   point of each mesh its joint goes to, see placement
+            mirror      right joints mirror the left ones, see mirror
+            parts       fingerprint the placements read instead of the meshes
+        '''
+        from . import mirror, placement
+        plan = self.plan
+        pairs, plane = self.mirror or ({}, 0.0)
+        meshes = [geo for geo in plan.meshes if geo not in pairs]
+        positions = dict(zip(meshes, placement.mesh_positions(meshes, self.placement, self.parts)))
+        for right, left in pairs.items():
+            positions[right] = mirror.mirror_points(positions[left], plane)
+        bases, toes = placement.foot_positions([positions[geo] for geo in plan.feet])
+        layout = []
+        for (base, toe), base_position, toe_position in zip(plan.feet.values(), bases, toes):
+            layout.append((base, None, base_position))
+            layout.append((toe, base, toe_position))
+        for geo, role in plan.meshes.items():
+            layout.append((plan.joints[role], None, positions[geo]))
+        layout.append((plan.root, None, (0.0, 0.0, 0.0)))
+        return layout
+
+class JointHierarchy:
+    '''Creating the hierarchy of which the skeleton should follow'''
+    def __init__(self, plan):
+        self.plan = plan
+        self.joint_hierarchy = plan.joint_parents
+        self.extremities = plan.extremities()
+    def create_joint_hierarchy(self):
+        '''Parenting the joints to create the skeleton hierarchy'''
+        plan = self.plan
+        for child, parent in self.joint_hierarchy.items():
+            cmds.parent(child, parent)
+        if not cmds.objExists(plan.jnt_grp):
+            cmds.createNode('transform', name=plan.jnt_grp, skipSelect=True)
+            cmds.parent(plan.root, plan.jnt_grp)
+        self.orient_joints()
+        if plan.dropped:
+            # Only now, so the joints an LOD keeps are oriented as in the full rig
+            from . import lod
+            lod.prune(plan)
+
+    def orient_joints(self):
+        '''Orients the whole skeleton in one pass: the Midsection hierarchy aims
+        down its joints with y up, finger tips keep a world orientation and the
+        other finger joints aim away from the hand. Only joints whose values
+        change are written'''
+        from . import orient
+        joints, parents, modes = self.skeleton()
+        positions = cmds.xform(joints, query=True, translation=True, worldSpace=True)
+        world = orient.orient_skeleton(joints, positions, parents, modes)
+        translate, joint_orient = orient.local_transforms(joints, positions, parents, world)
+        index = {joint: i for i, joint in enumerate(joints)}
+        parent_rotated = orient.rotated(world)
+        oriented = orient.rotated(orient.euler_matrices(joint_orient))
+        for i, joint in enumerate(joints):
+            parent = parents.get(joint)
+            if parent in index and parent_rotated[index[parent]]:
+                cmds.setAttr(joint + '.translate', *translate[i].tolist())
+            if oriented[i]:
+                cmds.setAttr(joint + '.jointOrient', *joint_orient[i].tolist())
+
+    def skeleton(self):
+        '''Returns (joints, parents, orientation modes) of the whole skeleton,
+        with every parent ahead of its children'''
+        from . import orient
+        plan = self.plan
+        parents = dict(self.joint_hierarchy)
+        parents.update({toe: base for base, toe in plan.feet.values()})
+        joints = orient.hierarchy_order(parents, [plan.root])
+
+        modes = {}
+        midsection = plan.joint('Midsection')
+        for joint in joints:
+            if joint == midsection or parents.get(joint) in modes:
+                modes[joint] = orient.AIM
+        tips, aimed = self.extremities
+        modes.update(dict.fromkeys(tips, orient.WORLD))
+        modes.update(dict.fromkeys(aimed, orient.FROM_PARENT))
+        return joints, parents, modes
+
+class ControlRig:
+    '''Creating the rig controllers'''
+    def __init__(self, plan, constrain=True, interactive=True):
+         self.plan = plan
+         self.constrain = constrain
+         self.interactive = interactive
+         self.joints = plan.controls
+         self.joint_rotate = plan.rotate_controls()
+    def create_rig_controllers(self):
+        '''Defining the conditions for which the controllers should be created'''
+        from . import controlShapes
+        plan = self.plan
+        root = plan.root
+
+        if not cmds.objExists(root):
+            warning_dialog(f"No existing {root} in scene.", self.interactive)
+            return
+
+        # Every joint's world matrix in one query
+        joints = list(self.joints.values())
+        matrices = cmds.xform(joints, query=True, matrix=True, worldSpace=True) if joints else []
+        for i, (ctrl_name, joint) in enumerate(self.joints.items()):
+            self.create_control(ctrl_name, joint, matrices[16 * i:16 * i + 16])
+
+        controlShapes.stamp(plan.main_ctrl, radius=1.0, colour=13)
+        controlShapes.stamp(plan.offset_ctrl, radius=0.8, colour=17)
+        if self.constrain:
+            cmds.parentConstraint(plan.offset_ctrl, root, mo=False)
+        print("Controllers Created.")
+
+    def create_control(self, ctrl_name, joint, matrix=None):
+        '''Stamps the controller circle of one joint, placed and oriented like
+        the joint. Controls in joint_rotate face down the joint'''
+        from . import controlShapes
+        if matrix is None:
+            matrix = cmds.xform(joint, query=True, matrix=True, worldSpace=True)
+        normal = (1, 0, 0) if ctrl_name in self.joint_rotate else (0, 1, 0)
+        controlShapes.stamp(ctrl_name, controlShapes.CIRCLE, normal=normal, radius=0.2, colour=13, matrix=matrix,
+            limits=True)
+        if self.constrain:
+            cmds.parentConstraint(ctrl_name, joint, mo=False)
+
+class OffsetGroup:
+    def __init__(self, plan):
+        self.plan = plan
+        self.curveSel = list(plan.controls) + [plan.main_ctrl, plan.offset_ctrl]
+    
+
+    def parent_to_group(self):
+        self.offset_controls(self.curveSel)
+        print(f"Parented controls to respective offset groups.")
+
+    def offset_controls(self, controls):
+        '''Puts controls under new offset groups that hold their placement,
+        each group made right under its parent control in one bulk pass'''
+        from . import zeroing
+        plan = self.plan
+        names = dict(plan.offsets)
+        names.update({plan.main_ctrl: plan.ctrl_grp, plan.offset_ctrl: plan.offset_grp})
+        parents = {ctrl: plan.control_parents.get(offset) for ctrl, offset in plan.offsets.items()}
+        parents[plan.offset_ctrl] = plan.main_ctrl
+        return zeroing.zero(controls, names=names, parents=parents)
+
+class SkinningRig:
+    '''Binds every body mesh to its joint in one pass. skinned can pass in the
+    meshes already known to be skinned, so characters rigged in one pass share
+    a single scan of the scene'''
+    def __init__(self, plan, combine=False, falloff=0.0, constrain=True, skinned=None):
+        self.plan = plan
+        self.constrain = constrain
+        self.combine = combine
+        self.falloff = falloff
+        self.skinned = skinned
+        self.queries = 0
+
+    def find_skinned_meshes(self):
+        '''Returns the transforms of every mesh that already has a skinCluster.
+        Costs one query per existing skinCluster instead of one history walk per mesh'''
+        skinned = set()
+        skinClusters = cmds.ls(type='skinCluster')
+        self.queries += 1
+        for skinCluster in skinClusters:
+            shapes = cmds.skinCluster(skinCluster, q=True, geometry=True) or []
+            self.queries += 1
+            if shapes:
+                skinned.update(cmds.listRelatives(shapes, parent=True) or [])
+                self.queries += 1
+        return skinned
+
+    def skin_assignment(self):
+        '''Mesh to influence joint for every mesh that still needs skinning'''
+        if self.skinned is None:
+            self.skinned = self.find_skinned_meshes()
+        return {mesh: joint for mesh, joint in self.plan.skin.items() if mesh not in self.skinned}
+
+    def skin_mesh(self):
+        self.queries = 0
+        assignment = self.skin_assignment()
+        if self.combine and assignment == self.plan.skin:
+            from .combinedSkin import CombinedSkin
+            CombinedSkin(self.plan, falloff=self.falloff).skin()
+        else:
+            for child, parent in assignment.items():
+                self.bind(child, parent)
+
+        if self.constrain:
+            self.constrain_controls(self.plan.controls)
+        print(f"Skinned {len(assignment)} meshes using {self.queries} scene queries.")
+
+    def bind(self, mesh, joint):
+        cmds.skinCluster(mesh, joint, tsb=True, bm=3, mi=1, nw=1, wd=0, omi=True, dr=4, rui=True, hmf=0.2, sm=0)
+
+    def constrain_controls(self, controls):
+        for child, parent in controls.items():
+            cmds.parentConstraint(child, parent, mo=False, weight=1)
+
+def _no_stage(name):
+    return contextlib.nullcontext()
+
+@contextlib.contextmanager
+def keep_selection():
+    '''Puts the selection back as it was, less any nodes deleted meanwhile.
+    The stages never read it, but curve() and a few other commands select
+    what they make'''
+    selection = cmds.ls(sl=True)
+    try:
+        yield
+    finally:
+        selection = cmds.ls(selection) if selection else []
+        if selection:
+            cmds.select(selection, replace=True)
+        else:
+            cmds.select(clear=True)
+
+@contextlib.contextmanager
+def build_scope(fast=FAST_MODE):
+    '''Makes a whole build one undo chunk that leaves the selection as it
+    was. In fast mode undo recording and viewport refresh are suspended
+    instead, and put back as they were once the build is done; a fast build
+    can't be undone'''
+    if not fast:
+        cmds.undoInfo(openChunk=True, chunkName='autoRig')
+        try:
+            with keep_selection():
+                yield
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        return
+    undo = cmds.undoInfo(query=True, state=True)
+    cmds.undoInfo(stateWithoutFlush=False)
+    cmds.refresh(suspend=True)
+    try:
+        with keep_selection():
+            yield
+    finally:
+        cmds.refresh(suspend=False)
+        cmds.undoInfo(stateWithoutFlush=undo)
+
+def build_rig(meshes=None, interactive=True, combine_skin=COMBINE_SKIN, skin_falloff=SKIN_FALLOFF, matrix_rig=MATRIX_RIG,
+        joint_placement=JOINT_PLACEMENT, incremental=INCREMENTAL, fast=FAST_MODE, skeleton=SKELETON, mirror=MIRROR,
+        lod=LOD, dry_run=False, profiler=None):
+    '''Rigs the character of the body meshes, or of the selection.
+
+        interactive      False raises RigError instead of opening a dialog
+        combine_skin     one skinCluster for all the meshes, see combinedSkin
+        skin_falloff     blend distance at the part boundaries, see combinedSkin
+        matrix_rig       matrix connections instead of constraints, see matrixRig
+        joint_placement  point of each mesh its joint goes to, see placement
+        incremental      rebuild only the changed parts, see incremental
+        fast             suspend undo and refresh instead of one undo chunk
+        skeleton         SkeletonTemplate of the body parts, see skeletonTemplate
+        mirror           mirror the right side from the left, see mirror
+        lod              lod.LODS preset or role patterns to drop, see lod
+        dry_run          only print the plan
+        profiler         RigProfiler recording every stage
+
+    Returns the plan, or None if the build was cancelled or the meshes belong
+    to several characters, which build_characters() rigs.'''
+    if meshes is None:
+        meshes = cmds.ls(sl=True)
+    characters = character_plans(meshes, skeleton)
+    if len(characters) > 1:
+        warning_dialog("The meshes belong to %d characters (%s). Please rig them with build_characters()."
+            % (len(characters), ", ".join(plan.prefix for plan in characters)), interactive)
+        return None
+    rigPlan, = build_characters(meshes, interactive=interactive, combine_skin=combine_skin, skin_falloff=skin_falloff,
+        matrix_rig=matrix_rig, joint_placement=joint_placement, incremental=incremental, fast=fast, skeleton=skeleton,
+        mirror=mirror, lod=lod, dry_run=dry_run, profiler=profiler)
+    return rigPlan
+
+def build_characters(meshes=None, interactive=True, combine_skin=COMBINE_SKIN, skin_falloff=SKIN_FALLOFF,
+        matrix_rig=MATRIX_RIG, joint_placement=JOINT_PLACEMENT, incremental=INCREMENTAL, fast=FAST_MODE,
+        skeleton=SKELETON, mirror=MIRROR, lod=LOD, dry_run=False, profiler=None):
+    '''Rigs every character among the meshes, told apart by prefix or
+    namespace, running each stage over all of them before the next one.
+    Takes the same options as build_rig and returns one entry per character:
+    its plan, or None if its build was cancelled.'''
+    if meshes is None:
+        meshes = cmds.ls(sl=True)
+    from . import lod as lodRig
+    lod = lodRig.patterns(lod)
+    plans = [lodRig.reduce(rigPlan, lod) for rigPlan in character_plans(meshes, skeleton)]
+    if dry_run:
+        for rigPlan in plans:
+            rigPlan.dry_run()
+        return plans
+    stage = profiler.stage if profiler else _no_stage
+    from . import incremental as incrementalRig
+    from . import mirror as mirrorRig
+    options = {'combine_skin': combine_skin, 'matrix_rig': matrix_rig, 'joint_placement': joint_placement,
+        'skeleton': skeleton.spec, 'mirror': mirror, 'lod': lod}
+    with build_scope(fast):
+        cancelled = set()
+        building = []
+        parts = {}
+        for rigPlan in plans:
+            status = incrementalRig.FULL
+            if incremental and rigPlan.meshes and cmds.objExists(rigPlan.jnt_grp):
+                with stage('incremental'):
+                    rebuild = incrementalRig.IncrementalRebuild(rigPlan, options, interactive=interactive)
+                    status = rebuild.update()
+                    parts[rigPlan] = rebuild.parts
+            if status == incrementalRig.STOPPED:
+                cancelled.add(rigPlan)
+            elif status == incrementalRig.FULL:
+                building.append(rigPlan)
+        if matrix_rig:
+            # Taken after the incremental updates, so the report counts the full builds only
+            from . import matrixRig
+            nodes_before = matrixRig.node_counts()
+        # Only incremental builds and mirroring need the fingerprint, the
+        # placement modes read their own meshes otherwise
+        if incremental or mirror:
+            with stage('fingerprint'):
+                # Taken before skinning, which may merge the meshes
+                for rigPlan in building:
+                    if rigPlan not in parts:
+                        parts[rigPlan] = incrementalRig.fingerprint(rigPlan)
+
+        with stage('skeleton'):
+            for rigPlan in list(building):
+                sides = mirrorRig.mirrored_sides(rigPlan, parts[rigPlan], joint_placement) if mirror else None
+                skelCreator = SkelCreator(rigPlan, interactive=interactive, placement=joint_placement, mirror=sides,
+                    parts=parts.get(rigPlan))
+                if not skelCreator.create_skeleton():
+                    building.remove(rigPlan)
+                    cancelled.add(rigPlan)
+
+        with stage('hierarchy'):
+            for rigPlan in building:
+                jointHierarchy = JointHierarchy(rigPlan)
+                jointHierarchy.create_joint_hierarchy()
+
+        with stage('controllers'):
+            for rigPlan in building:
+                controlRig = ControlRig(rigPlan, constrain=not matrix_rig, interactive=interactive)
+                controlRig.create_rig_controllers()
+
+        with stage('offsets'):
+            for rigPlan in building:
+                if matrix_rig:
+                    matrixRig.MatrixRig(rigPlan).build()
+                else:
+                    offsetGroup = OffsetGroup(rigPlan)
+                    offsetGroup.parent_to_group()
+                # Safe now that the offsets hold the placement and the translations are zero
+                from . import controlShapes
+                controlShapes.lock_translation(rigPlan.controls)
+
+        with stage('skinning'):
+            # Skinning one character never skins another's meshes, so one scan serves them all
+            skinned = None
+            for rigPlan in building:
+                skinningRig = SkinningRig(rigPlan, combine=combine_skin, falloff=skin_falloff,
+                    constrain=not matrix_rig, skinned=skinned)
+                skinningRig.skin_mesh()
+                skinned = skinningRig.skinned
+        if incremental:
+            with stage('fingerprint'):
+                for rigPlan in building:
+                    incrementalRig.store(rigPlan, options, parts[rigPlan])
+        if matrix_rig and building:
+            matrixRig.report(nodes_before, matrixRig.node_counts(), len(building))
+    return [None if rigPlan in cancelled else rigPlan for rigPlan in plans]
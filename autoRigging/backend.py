@@ -0,0 +1,51 @@
+'''Scene command backend.
+
+Every module in the package talks to Maya through the cmds and mel objects
+defined here. They import maya.cmds and maya.mel on first use, so importing
+the package never starts Maya, and set_backend() swaps in another
+implementation such as fakeCmds.
+'''
+import importlib
+
+
+class LazyModule:
+    '''Forwards attribute access to a module that is imported on first use'''
+    def __init__(self, module_name):
+        self._module_name = module_name
+        self._module = None
+
+    def __getattr__(self, name):
+        if self._module is None:
+            self._module = importlib.import_module(self._module_name)
+        return getattr(self._module, name)
+
+
+cmds = LazyModule('maya.cmds')
+mel = LazyModule('maya.mel')
+
+
+def set_backend(cmds_module, mel_module=None):
+    '''Routes every cmds (and optionally mel) call to the given module'''
+    cmds._module = cmds_module
+    if mel_module is not None:
+        mel._module = mel_module
+
+
+def use_maya():
+    '''Goes back to maya.cmds and maya.mel'''
+    cmds._module = None
+    mel._module = None
+
+
+def use_fake():
+    '''Switches to the in-memory fakeCmds scene and returns it'''
+    from . import fakeCmds
+    set_backend(fakeCmds, fakeCmds.mel)
+    return fakeCmds
+
+
+def current():
+    '''The module cmds calls currently go to'''
+    if cmds._module is None:
+        cmds._module = importlib.import_module(cmds._module_name)
+    return cmds._module
@@ -0,0 +1,157 @@
+'''Headless batch rigging of many characters across a pool of worker processes.
+
+Each worker is its own standalone interpreter: it initializes Maya (or the
+fakeCmds scene) once and then rigs every character it is handed. Warning
+dialogs become RigError failures in the report.
+
+    mayapy -m autoRigging.batchRig manifest.txt --workers 8 --output rigged --report report.json
+    python -m autoRigging.batchRig manifest.txt --backend fake
+
+The manifest lists one character file per line (blank lines and lines
+starting with # are skipped), or is a JSON list of paths. A file may hold
+several characters; they are all rigged.
+'''
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import autoRigger, backend, lod, placement
+from .backend import cmds
+from .profiler import RigProfiler
+from .skeletonTemplate import SkeletonTemplate
+
+
+def read_manifest(path):
+    '''Character file paths listed in a manifest, relative to the manifest'''
+    with open(path) as handle:
+        text = handle.read()
+    if text.lstrip().startswith('['):
+        entries = json.loads(text)
+    else:
+        entries = [line.strip() for line in text.splitlines()]
+        entries = [line for line in entries if line and not line.startswith('#')]
+    root = os.path.dirname(os.path.abspath(path))
+    return [os.path.join(root, entry) for entry in entries]
+
+
+def init_worker(backend_name):
+    '''Starts the scene backend once per worker process'''
+    if backend_name == 'fake':
+        backend.use_fake()
+    else:
+        import maya.standalone
+        maya.standalone.initialize(name='python')
+
+
+def character_meshes():
+    '''Transforms of every mesh in the open scene'''
+    shapes = cmds.ls(type='mesh', ni=True)
+    if not shapes:
+        return []
+    return cmds.listRelatives(shapes, parent=True) or []
+
+
+def rig_character(path, output_dir=None, options=None, profile=False):
+    '''Opens one character file, rigs it and saves the result.
+    Returns a report entry instead of raising.'''
+    start = time.perf_counter()
+    result = {'character': path, 'ok': False, 'seconds': 0.0, 'error': None, 'output': None}
+    try:
+        cmds.file(path, open=True, force=True)
+        profiler = RigProfiler() if profile else None
+        plans = autoRigger.build_characters(character_meshes(), interactive=False, profiler=profiler,
+            **(options or {}))
+        # Cancelled characters come back as None, and a plan without joints rigged nothing
+        rigged = [plan for plan in plans if plan and plan.joints]
+        result['rigs'] = len(rigged)
+        result['invalid'] = [mesh for plan in plans if plan for mesh in plan.invalid]
+        result['missing'] = [part for plan in plans if plan for part in plan.missing]
+        if profiler:
+            result['profile'] = profiler.to_dict()
+        if not rigged:
+            raise autoRigger.RigError("No mesh matches the skeleton template, nothing was rigged.")
+        if output_dir:
+            output = os.path.join(output_dir, os.path.basename(path))
+            cmds.file(rename=output)
+            cmds.file(save=True, force=True)
+            result['output'] = output
+        result['ok'] = True
+    except Exception as error:
+        result['error'] = '%s: %s' % (type(error).__name__, error)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def run_batch(paths, workers=1, backend_name='maya', output_dir=None, options=None, profile=False):
+    '''Rigs every character across the worker pool, returns the report'''
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+            initializer=init_worker, initargs=(backend_name,)) as pool:
+        results = list(pool.map(rig_character, paths, [output_dir] * len(paths), [options] * len(paths),
+            [profile] * len(paths)))
+    wall = time.perf_counter() - start
+    return {
+        'workers': workers,
+        'backend': backend_name,
+        'characters': len(paths),
+        'succeeded': sum(result['ok'] for result in results),
+        'wall_seconds': wall,
+        'characters_per_second': len(paths) / wall if wall else 0.0,
+        'results': results,
+    }
+
+
+def summary(report):
+    '''Readable per-character report'''
+    lines = []
+    for result in report['results']:
+        status = 'ok' if result['ok'] else 'FAILED'
+        line = '%-8s %8.3fs  %s' % (status, result['seconds'], result['character'])
+        if result['error']:
+            line += '  (%s)' % result['error']
+        lines.append(line)
+    lines.append('%d/%d characters rigged in %.2fs on %d workers (%.2f characters/s)' % (
+        report['succeeded'], report['characters'], report['wall_seconds'],
+        report['workers'], report['characters_per_second']))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rig many characters headlessly.')
+    parser.add_argument('manifest', help='file listing the character scenes to rig')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--backend', choices=('maya', 'fake'), default='maya')
+    parser.add_argument('--output', help='directory to save the rigged scenes to')
+    parser.add_argument('--report', help='write the JSON report to this file')
+    parser.add_argument('--matrix-rig', action='store_true', help='build the constraint-free matrix rig')
+    parser.add_argument('--combine-skin', action='store_true', help='bind one merged mesh with one skinCluster')
+    parser.add_argument('--joint-placement', choices=placement.MODES, default=placement.PIVOT,
+        help='point of each mesh its joint is placed at')
+    parser.add_argument('--lod', choices=list(lod.LODS), help='build a lighter LOD rig for crowd agents')
+    parser.add_argument('--mirror', action='store_true', help='mirror the right side from the left when symmetric')
+    parser.add_argument('--skeleton', default='stock',
+        help='skeleton template: a preset (stock, high, dense) or a spec like spine=6,fingers=5,finger_joints=3,twist=2')
+    parser.add_argument('--fast', action='store_true', help='build with undo and viewport refresh suspended')
+    parser.add_argument('--profile', action='store_true', help='add per-stage timings and command counts to the report')
+    args = parser.parse_args(argv)
+
+    options = {'matrix_rig': args.matrix_rig, 'combine_skin': args.combine_skin,
+        'joint_placement': args.joint_placement, 'fast': args.fast,
+        'skeleton': SkeletonTemplate.parse(args.skeleton), 'mirror': args.mirror, 'lod': args.lod}
+    report = run_batch(read_manifest(args.manifest), args.workers, args.backend, args.output, options, args.profile)
+    print(summary(report))
+    if args.report:
+        with open(args.report, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    return 0 if report['succeeded'] == report['characters'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+'''Optional skinning mode that merges the body pieces into a single mesh
+bound by one skinCluster, instead of one rigid skinCluster per piece.
+
+compute_weights() is plain NumPy and doesn't need Maya.
+'''
+import numpy as np
+
+from . import backend
+from .backend import cmds
+
+
+def compute_weights(part_ids, part_influence, num_influences, positions=None,
+        pivots=None, parent_influence=None, falloff=0.0):
+    '''Returns the (vertices x influences) weight matrix of the merged mesh.
+
+    part_ids gives the body part of each vertex and part_influence the
+    influence index of each part. With a falloff of 0 every vertex is bound
+    rigidly to its part. Otherwise each influence meets its parent influence
+    at its part's pivot, and the vertices of both sides closer than falloff
+    to that pivot blend linearly towards the other side, reaching 50/50 right
+    at the pivot. A vertex near several boundaries keeps at least half its
+    weight on its own influence.'''
+    part_ids = np.asarray(part_ids, dtype=np.intp)
+    part_influence = np.asarray(part_influence, dtype=np.intp)
+    own = part_influence[part_ids]
+    rows = np.arange(len(part_ids))
+    weights = np.zeros((len(part_ids), num_influences))
+    if falloff <= 0.0 or positions is None:
+        weights[rows, own] = 1.0
+        return weights
+
+    positions = np.asarray(positions, dtype=float)
+    # One boundary per influence with a parent, at the pivot of its part
+    boundary_parent = np.full(num_influences, -1, dtype=np.intp)
+    boundary_pivot = np.zeros((num_influences, 3))
+    boundary_parent[part_influence] = np.asarray(parent_influence, dtype=np.intp)
+    boundary_pivot[part_influence] = np.asarray(pivots, dtype=float)
+    for child in np.flatnonzero(boundary_parent >= 0):
+        parent = boundary_parent[child]
+        near = np.flatnonzero((own == child) | (own == parent))
+        distance = np.linalg.norm(positions[near] - boundary_pivot[child], axis=1)
+        inside = distance < falloff
+        near, distance = near[inside], distance[inside]
+        other = np.where(own[near] == child, parent, child)
+        np.add.at(weights, (near, other), 0.5 * (1.0 - distance / falloff))
+
+    blended = weights.sum(axis=1)
+    scale = np.where(blended > 0.5, 0.5 / np.maximum(blended, 1e-12), 1.0)
+    weights *= scale[:, None]
+    weights[rows, own] = 1.0 - blended * scale
+    return weights
+
+
+def part_ids_from_counts(vertex_counts):
+    '''Part index of every vertex when the pieces are merged in order'''
+    return np.repeat(np.arange(len(vertex_counts)), vertex_counts)
+
+
+class CombinedSkin:
+    '''Merges the geo_grp pieces and binds them with a single skinCluster'''
+    def __init__(self, plan, falloff=0.0, name=None):
+        self.plan = plan
+        self.falloff = falloff
+        self.name = name or plan.scoped('body_geo')
+
+    def influences(self):
+        '''Influence joints in a fixed order, plus their parents when the
+        falloff needs them'''
+        plan = self.plan
+        influences = list(dict.fromkeys(plan.skin.values()))
+        if self.falloff > 0.0:
+            for joint in list(influences):
+                parent = plan.joint_parents.get(joint)
+                if parent and parent != plan.root and parent not in influences:
+                    influences.append(parent)
+        return influences
+
+    def skin(self):
+        '''Merges the meshes, binds them and writes all weights in one call'''
+        plan = self.plan
+        meshes = list(plan.skin)
+        if not meshes:
+            return None
+        influences = self.influences()
+        index = {joint: i for i, joint in enumerate(influences)}
+        part_influence = [index[plan.skin[mesh]] for mesh in meshes]
+        parent_influence = [index.get(plan.joint_parents.get(plan.skin[mesh]), -1) for mesh in meshes]
+        vertex_counts = [cmds.polyEvaluate(mesh, vertex=True) for mesh in meshes]
+
+        combined = cmds.polyUnite(meshes, n=self.name, ch=False, mergeUVSets=1)[0]
+        if cmds.objExists(plan.geo_grp):
+            combined = cmds.parent(combined, plan.geo_grp)[0]
+
+        positions = pivots = None
+        if self.falloff > 0.0:
+            positions = np.array(cmds.xform(combined + '.vtx[*]', q=True, t=True, ws=True)).reshape(-1, 3)
+            pivots = np.array([cmds.xform(plan.skin[mesh], q=True, t=True, ws=True) for mesh in meshes])
+        weights = compute_weights(part_ids_from_counts(vertex_counts), part_influence, len(influences),
+            positions=positions, pivots=pivots, parent_influence=parent_influence, falloff=self.falloff)
+
+        skinCluster = cmds.skinCluster(combined, influences, tsb=True, bm=0, nw=1, omi=False,
+            n=self.name + '_skinCluster')[0]
+        set_weights(skinCluster, combined, influences, weights)
+        print(f"Bound {len(meshes)} pieces to {combined} with one skinCluster.")
+        return skinCluster
+
+
+def set_weights(skinCluster, mesh, influences, weights):
+    '''Writes a full (vertices x influences) weight matrix with a single API
+    call. A backend without the Maya API, such as fakeCmds, provides
+    set_skin_weights() for it instead'''
+    write = getattr(backend.current(), 'set_skin_weights', None)
+    if write is not None:
+        return write(skinCluster, mesh, influences, weights)
+
+    import maya.api.OpenMaya as om
+    import maya.api.OpenMayaAnim as oma
+
+    sel = om.MSelectionList()
+    sel.add(mesh)
+    sel.add(skinCluster)
+    dag_path = sel.getDagPath(0)
+    fn_skin = oma.MFnSkinCluster(sel.getDependNode(1))
+
+    # Reorder columns to match the skinCluster's own influence order
+    order = [path.partialPathName() for path in fn_skin.influenceObjects()]
+    columns = [influences.index(name) for name in order]
+
+    component = om.MFnSingleIndexedComponent()
+    vertices = component.create(om.MFn.kMeshVertComponent)
+    component.setCompleteData(weights.shape[0])
+    fn_skin.setWeights(dag_path, vertices, om.MIntArray(list(range(len(order)))),
+        om.MDoubleArray(weights[:, columns].ravel().tolist()), normalize=False)
@@ -0,0 +1,132 @@
+'''Control shape library.
+
+Each shape is built once per session into a cached template: its degree,
+whether it is periodic and its CVs, lying flat in the xz plane with y as the
+normal like circle(nr=(0, 1, 0)). New controls are stamped from a template
+with a single curve() call, which leaves no construction history to bake.
+They are placed with one xform and get their colour and scale limits right
+after, instead of circle, bakePartialHistory, makeIdentity and a
+listRelatives for the shape.
+
+    stamp('Head_ctrl', CIRCLE, radius=0.2, colour=13, matrix=joint_matrix, limits=True)
+    lock_translation(controls)      # once offsets have zeroed their translation
+'''
+import numpy as np
+
+from .backend import cmds
+
+CIRCLE = 'circle'
+SQUARE = 'square'
+ARROW = 'arrow'
+CROSS = 'cross'
+
+UP = (0, 1, 0)
+
+# Linear shapes as (x, z) outlines, closed by repeating the first point
+_OUTLINES = {
+    SQUARE: [(-1, -1), (-1, 1), (1, 1), (1, -1), (-1, -1)],
+    ARROW: [(0, -1), (0.6, -0.2), (0.25, -0.2), (0.25, 1), (-0.25, 1), (-0.25, -0.2), (-0.6, -0.2), (0, -1)],
+    CROSS: [(-0.25, -1), (0.25, -1), (0.25, -0.25), (1, -0.25), (1, 0.25), (0.25, 0.25), (0.25, 1),
+        (-0.25, 1), (-0.25, 0.25), (-1, 0.25), (-1, -0.25), (-0.25, -0.25), (-0.25, -1)],
+}
+SHAPES = (CIRCLE,) + tuple(_OUTLINES)
+
+# shape -> (degree, periodic, cvs), filled on first use
+_templates = {}
+
+
+def _build_circle():
+    '''Reads the CVs of a unit circle made by Maya itself, then deletes it'''
+    ctrl = cmds.circle(nr=UP, c=(0, 0, 0), r=1.0, ch=False)[0]
+    shape = cmds.listRelatives(ctrl, shapes=True)[0]
+    degree = cmds.getAttr(shape + '.degree')
+    # Periodic curves repeat their first degree CVs at the end
+    cvs = cmds.getAttr(shape + '.cv[*]')[:cmds.getAttr(shape + '.spans')]
+    cmds.delete(ctrl)
+    return degree, True, np.array(cvs, dtype=float).reshape(-1, 3)
+
+
+def template(shape):
+    '''(degree, periodic, cvs) of a unit shape, built on first use'''
+    if shape not in _templates:
+        if shape == CIRCLE:
+            _templates[shape] = _build_circle()
+        elif shape in _OUTLINES:
+            outline = np.array(_OUTLINES[shape], dtype=float)
+            cvs = np.column_stack([outline[:, 0], np.zeros(len(outline)), outline[:, 1]])
+            _templates[shape] = (1, False, cvs)
+        else:
+            raise ValueError("Unknown control shape %r, expected one of %s" % (shape, ", ".join(SHAPES)))
+    return _templates[shape]
+
+
+def clear_cache():
+    '''Forgets the templates, so they are built again on next use'''
+    _templates.clear()
+
+
+def _frame(normal):
+    '''Rotation taking the template's y axis onto normal'''
+    y = np.asarray(normal, dtype=float)
+    y = y / np.linalg.norm(y)
+    reference = np.array([1.0, 0.0, 0.0]) if abs(y[0]) < 0.9 else np.array([0.0, -1.0, 0.0])
+    z = np.cross(reference, y)
+    z /= np.linalg.norm(z)
+    return np.stack([np.cross(y, z), y, z])
+
+
+def shape_points(shape, normal=UP, radius=1.0):
+    '''Returns (degree, periodic, cvs) of a shape facing normal, scaled by radius'''
+    degree, periodic, cvs = template(shape)
+    return degree, periodic, cvs @ _frame(normal) * radius
+
+
+def knots(count, degree, periodic):
+    '''Knot vector of a uniform curve through count CVs'''
+    if periodic:
+        return list(range(-(degree - 1), count + degree))
+    spans = count - degree
+    return [0] * (degree - 1) + list(range(spans + 1)) + [spans] * (degree - 1)
+
+
+def create_curve(name, degree, periodic, cvs, colour=None, limits=False):
+    '''Creates a control curve from its CVs in one curve() call, then sets the
+    shape's colour override and, with limits, locks its scale to 1.
+    Returns the control's name'''
+    points = np.asarray(cvs, dtype=float).tolist()
+    count = len(points)
+    if periodic:
+        points += points[:degree]
+    ctrl = cmds.curve(n=name, d=degree, p=points, per=bool(periodic), k=knots(count, degree, periodic))
+    if colour is not None:
+        cmds.setAttr(ctrl + 'Shape.overrideEnabled', 1)
+        cmds.setAttr(ctrl + 'Shape.overrideColor', colour)
+    if limits:
+        cmds.transformLimits(ctrl, sx=(1, 1), sy=(1, 1), sz=(1, 1), esx=(True, True), esy=(True, True),
+            esz=(True, True))
+    return ctrl
+
+
+def stamp(name, shape=CIRCLE, normal=UP, radius=1.0, colour=None, matrix=None, position=None, limits=False):
+    '''Creates a control from a shape template. matrix is the flat world
+    matrix to place it with. position instead bakes a world position into the
+    CVs and puts the pivots there, leaving translate at zero as a frozen
+    transform would. limits locks its scale'''
+    degree, periodic, cvs = shape_points(shape, normal, radius)
+    if position is not None:
+        cvs = cvs + np.asarray(position, dtype=float)
+    ctrl = create_curve(name, degree, periodic, cvs, colour=colour, limits=limits)
+    if matrix is not None:
+        cmds.xform(ctrl, matrix=list(matrix), worldSpace=True)
+    elif position is not None:
+        cmds.xform(ctrl, pivots=list(position), worldSpace=True)
+    return ctrl
+
+
+def lock_translation(controls):
+    '''Locks the translation of controls at zero in one call. Only for
+    controls whose offset already holds their placement, as limits clamp the
+    current value'''
+    if controls:
+        cmds.transformLimits(list(controls), tx=(0, 0), ty=(0, 0), tz=(0, 0), etx=(True, True), ety=(True, True),
+            etz=(True, True))
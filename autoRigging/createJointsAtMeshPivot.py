@@ -0,0 +1,25 @@
+from .backend import cmds
+
+def createJointAtMeshPivot(meshes=None):
+    '''Creates a joint at the pivot of each mesh (the selection by default)'''
+    root = 'root_jnt'
+    sel = cmds.ls(sl=True) if meshes is None else meshes
+    if not sel:
+        cmds.warning("No object selected.")
+        return
+
+    cmds.undoInfo(openChunk=True)
+    try:
+        # Joints made with createNode never go under the selection, so it
+        # doesn't need clearing between them
+        for geo in sel:
+            piv = cmds.xform(geo, q=True, piv=True, ws=True)
+            joint = cmds.createNode('joint', n=geo + '%s' % "_jnt", skipSelect=True)
+            cmds.setAttr(joint + '.translate', *piv[0:3])
+            cmds.setAttr(joint + '.radius', 3)
+
+        if not cmds.objExists(root):
+            cmds.createNode('joint', n=root, skipSelect=True)
+            cmds.setAttr(root + '.radius', 3)
+    finally:
+        cmds.undoInfo(closeChunk=True)
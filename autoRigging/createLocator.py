@@ -0,0 +1,8 @@
+from .backend import cmds
+
+def locatorCreator(objects=None):
+    '''Creates a locator above each object (the selection by default)'''
+    from . import zeroing
+    sel = cmds.ls(sl=True) if objects is None else objects
+
+    return zeroing.zero(sel, names={obj: obj.replace("_ctrl", "_loc") for obj in sel}, locators=True)
@@ -0,0 +1,18 @@
+from .backend import cmds
+
+def createRigControllers(joints=None):
+    '''Creates a circle controller on each joint (the selection by default)'''
+    # For this to work, there cannot be another joint chain
+    # with the same names in the scene.
+    from . import controlShapes
+    sel = cmds.ls(sl=True) if joints is None else joints
+    cmds.undoInfo(openChunk=True)
+    try:
+        for joint in sel:
+            joint_translate = cmds.xform(joint, query=True, translation=True, worldSpace=True)
+
+            ctrl_name = joint.replace('_jnt', '_ctrl')
+            # Frozen at the joint, so zeroing the control puts it back there
+            controlShapes.stamp(ctrl_name, controlShapes.CIRCLE, radius=0.2, colour=13, position=joint_translate)
+    finally:
+        cmds.undoInfo(closeChunk=True)
@@ -0,0 +1,884 @@
+'''In-memory stand-in for maya.cmds.
+
+Implements the subset of commands the rigger issues on a small scene model
+(names, node types, DAG parenting, translations, plain attributes and
+connections) so the pipeline, the batch scheduler and the benchmarks can run
+on a machine without Maya. World transforms compose translate, rotate,
+jointOrient and offsetParentMatrix (rotation order xyz, no scale or pivots).
+An offsetParentMatrix can be set or driven by a multMatrix whose inputs are
+set or connected to world and world inverse matrices, which is all the
+matrix rig needs. Scenes are saved and
+opened as JSON. Commands that change the scene or the selection are counted
+as undo queue entries the way Maya records them, so undo_queue() can show
+what a build leaves in the queue.
+
+Switch the package over to it with autoRigging.backend.use_fake().
+'''
+import fnmatch
+import functools
+import json
+import math
+import types
+
+# Parent type of every node type the fake knows, for ls(type=...) filtering
+INHERITS = {
+    'transform': 'dagNode',
+    'joint': 'transform',
+    'shape': 'dagNode',
+    'mesh': 'shape',
+    'nurbsCurve': 'shape',
+    'locator': 'shape',
+    'constraint': 'transform',
+    'parentConstraint': 'constraint',
+    'orientConstraint': 'constraint',
+    'aimConstraint': 'constraint',
+    'geometryFilter': 'dependNode',
+    'skinCluster': 'geometryFilter',
+    'dagNode': 'dependNode',
+}
+
+_ALIASES = {
+    't': 'translate', 'r': 'rotate', 's': 'scale', 'jo': 'jointOrient',
+    'tx': 'translateX', 'ty': 'translateY', 'tz': 'translateZ',
+    'rx': 'rotateX', 'ry': 'rotateY', 'rz': 'rotateZ',
+    'sx': 'scaleX', 'sy': 'scaleY', 'sz': 'scaleZ',
+}
+_VECTORS = ('translate', 'rotate', 'scale', 'jointOrient', 'rotateAxis', 'rotatePivot', 'scalePivot')
+
+
+class Node:
+    def __init__(self, name, node_type, parent=None):
+        self.name = name
+        self.type = node_type
+        self.parent = parent
+        self.children = []
+        self.attrs = {}
+        if is_type(node_type, 'transform'):
+            self.attrs.update(translate=[0.0, 0.0, 0.0], rotate=[0.0, 0.0, 0.0], scale=[1.0, 1.0, 1.0])
+        if node_type == 'joint':
+            self.attrs['jointOrient'] = [0.0, 0.0, 0.0]
+
+
+class Scene:
+    def __init__(self):
+        self.nodes = {}
+        self.selection = []
+        self.connections = []
+        self.inputs = {}            # destination plug -> source plug
+        self.file_name = ''
+        self.undo = True
+        self.undo_queue = 0         # undo queue entries recorded so far
+        self.chunks = 0             # depth of open undo chunks
+
+    def create(self, name, node_type, parent=None):
+        name = self.unique_name(name or node_type + '1')
+        node = Node(name, node_type, parent)
+        self.nodes[name] = node
+        if parent is not None:
+            self.nodes[parent].children.append(name)
+        return name
+
+    def unique_name(self, name):
+        if name not in self.nodes:
+            return name
+        base = name.rstrip('0123456789')
+        index = 1
+        while base + str(index) in self.nodes:
+            index += 1
+        return base + str(index)
+
+
+scene = Scene()
+
+
+def is_type(node_type, wanted):
+    while node_type is not None:
+        if node_type == wanted:
+            return True
+        node_type = INHERITS.get(node_type)
+    return False
+
+
+def _undoable(command):
+    '''Records a non-query call of command as one undo queue entry, or as
+    part of the open chunk'''
+    @functools.wraps(command)
+    def recorded(*args, **kwargs):
+        if scene.undo and not scene.chunks and not (kwargs.get('q') or kwargs.get('query')):
+            scene.undo_queue += 1
+        return command(*args, **kwargs)
+    return recorded
+
+
+def _flatten(args):
+    names = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            names.extend(_flatten(arg))
+        elif arg is not None:
+            names.append(arg)
+    return names
+
+
+def _short(name):
+    return name.split('|')[-1]
+
+
+def _plug(plug):
+    node, _, attr = plug.partition('.')
+    return _short(node) + '.' + attr
+
+
+def _node(name):
+    name = _short(name)
+    if name not in scene.nodes:
+        raise ValueError("No object matches name: %s" % name)
+    return scene.nodes[name]
+
+
+def _targets(args):
+    '''Objects given as arguments, or the selection when there are none'''
+    names = [_short(name) for name in _flatten(args)]
+    return names if names else list(scene.selection)
+
+
+def _match(patterns):
+    names = []
+    for pattern in patterns:
+        pattern = _short(pattern)
+        if pattern in scene.nodes:
+            names.append(pattern)
+        elif any(char in pattern for char in '*?['):
+            names.extend(name for name in scene.nodes if fnmatch.fnmatchcase(name, pattern))
+    return list(dict.fromkeys(names))
+
+
+def _descendants(name):
+    found = []
+    for child in scene.nodes[name].children:
+        found.append(child)
+        found.extend(_descendants(child))
+    return found
+
+
+def _euler(angles):
+    '''Rotation matrix (rows are the axes) of xyz euler angles in degrees'''
+    a, b, c = (math.radians(angle) for angle in angles)
+    ca, sa, cb, sb, cc, sc = math.cos(a), math.sin(a), math.cos(b), math.sin(b), math.cos(c), math.sin(c)
+    return [[cb * cc, cb * sc, -sb],
+        [sa * sb * cc - ca * sc, sa * sb * sc + ca * cc, sa * cb],
+        [ca * sb * cc + sa * sc, ca * sb * sc - sa * cc, ca * cb]]
+
+
+def _mult(a, b):
+    return [[sum(a[i][k] * b[k][j] for k in range(3)) for j in range(3)] for i in range(3)]
+
+
+def _apply(vector, matrix):
+    return [sum(vector[k] * matrix[k][j] for k in range(3)) for j in range(3)]
+
+
+def _euler_of(rotation):
+    '''xyz euler angles in degrees of a rotation matrix, inverse of _euler'''
+    b = math.asin(max(-1.0, min(1.0, -rotation[0][2])))
+    if abs(rotation[0][2]) > 1.0 - 1e-9:
+        return [math.degrees(math.atan2(-rotation[2][1], rotation[1][1])), math.degrees(b), 0.0]
+    return [math.degrees(math.atan2(rotation[1][2], rotation[2][2])), math.degrees(b),
+        math.degrees(math.atan2(rotation[0][1], rotation[0][0]))]
+
+
+def _transpose(matrix):
+    return [list(row) for row in zip(*matrix)]
+
+
+def _local_rotation(node):
+    rotation = _euler(node.attrs.get('rotate', [0.0, 0.0, 0.0]))
+    if 'jointOrient' in node.attrs:
+        rotation = _mult(rotation, _euler(node.attrs['jointOrient']))
+    return rotation
+
+
+def _identity():
+    return [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]], [0.0, 0.0, 0.0]
+
+
+def _compose(first, second):
+    '''(rotation, position) of first followed by second'''
+    return _mult(first[0], second[0]), [a + b for a, b in zip(_apply(first[1], second[0]), second[1])]
+
+
+def _inverse(transform):
+    rotation = _transpose(transform[0])
+    return rotation, [-value for value in _apply(transform[1], rotation)]
+
+
+def _split(matrix):
+    '''(rotation, position) of a flat 4x4 matrix, its scale ignored'''
+    return [list(matrix[0:3]), list(matrix[4:7]), list(matrix[8:11])], list(matrix[12:15])
+
+
+def _plug_matrix(plug, cache=None):
+    '''(rotation, position) a matrix plug evaluates to'''
+    if plug in scene.inputs:
+        return _plug_matrix(scene.inputs[plug], cache)
+    name, attr = plug.split('.', 1)
+    name = _short(name)
+    if attr.startswith('worldMatrix'):
+        return _world_transform(name, cache)
+    if attr.startswith('worldInverseMatrix'):
+        return _inverse(_world_transform(name, cache))
+    if attr == 'matrixSum':
+        result = _identity()
+        index = 0
+        while '%s.matrixIn[%d]' % (name, index) in scene.inputs or 'matrixIn[%d]' % index in scene.nodes[name].attrs:
+            result = _compose(result, _plug_matrix('%s.matrixIn[%d]' % (name, index), cache))
+            index += 1
+        return result
+    matrix = scene.nodes[name].attrs.get(attr)
+    return _split(matrix) if matrix else _identity()
+
+
+def _parent_space(name, cache=None):
+    '''World (rotation, position) of the space a node's own transform sits
+    in: its offsetParentMatrix followed by its parent's world transform'''
+    node = scene.nodes[name]
+    space = _world_transform(node.parent, cache)
+    plug = name + '.offsetParentMatrix'
+    if plug in scene.inputs or 'offsetParentMatrix' in node.attrs:
+        space = _compose(_plug_matrix(plug, cache), space)
+    return space
+
+
+def _world_transform(name, cache=None):
+    '''World (rotation, position) of a node. cache holds the transforms
+    already worked out during one evaluation, which matrix connections reach
+    more than once'''
+    if name is None:
+        return _identity()
+    if cache is None:
+        cache = {}
+    if name not in cache:
+        node = scene.nodes[name]
+        translate = node.attrs.get('translate', [0.0, 0.0, 0.0])
+        cache[name] = _compose((_local_rotation(node), translate), _parent_space(name, cache))
+    return cache[name]
+
+
+def _world(name):
+    return _world_transform(name)[1]
+
+
+def _set_world(name, position):
+    node = scene.nodes[name]
+    parent_rotation, parent_position = _parent_space(name)
+    node.attrs['translate'] = _apply([a - b for a, b in zip(position, parent_position)], _transpose(parent_rotation))
+
+
+def _reparent(name, parent, relative=False):
+    node = scene.nodes[name]
+    rotation, world = _world_transform(name)
+    if node.parent is not None:
+        scene.nodes[node.parent].children.remove(name)
+    node.parent = parent
+    if parent is not None:
+        scene.nodes[parent].children.append(name)
+    if not relative and 'translate' in node.attrs:
+        _set_world(name, world)
+        # Keep the world rotation, leaving jointOrient as it is
+        local = _mult(rotation, _transpose(_parent_space(name)[0]))
+        if 'jointOrient' in node.attrs:
+            local = _mult(local, _transpose(_euler(node.attrs['jointOrient'])))
+        node.attrs['rotate'] = _euler_of(local)
+
+
+# -----------------------------------------------------------------------------
+# Scene queries
+
+def ls(*args, **kwargs):
+    if kwargs.get('sl') or kwargs.get('selection'):
+        names = list(scene.selection)
+        if args:
+            names = [name for name in names if name in _match(_flatten(args))]
+    elif args:
+        names = _match(_flatten(args))
+    else:
+        names = list(scene.nodes)
+    node_type = kwargs.get('type', kwargs.get('typ'))
+    if node_type:
+        wanted = node_type if isinstance(node_type, (list, tuple)) else [node_type]
+        names = [name for name in names if any(is_type(scene.nodes[name].type, t) for t in wanted)]
+    if kwargs.get('g') or kwargs.get('geometry'):
+        names = [name for name in names if is_type(scene.nodes[name].type, 'shape')]
+    return names
+
+
+def objExists(name):
+    if '.' in name:
+        node, attr = name.split('.', 1)
+        return _short(node) in scene.nodes and _ALIASES.get(attr, attr) in scene.nodes[_short(node)].attrs
+    return bool(_match([name]))
+
+
+def listRelatives(*args, **kwargs):
+    found = []
+    for name in _targets(args):
+        node = _node(name)
+        if kwargs.get('parent') or kwargs.get('p'):
+            relatives = [node.parent] if node.parent else []
+        elif kwargs.get('allDescendents') or kwargs.get('ad'):
+            relatives = _descendants(node.name)
+        else:
+            relatives = list(node.children)
+        if kwargs.get('shapes') or kwargs.get('s'):
+            relatives = [child for child in relatives if is_type(scene.nodes[child].type, 'shape')]
+        node_type = kwargs.get('type')
+        if node_type:
+            relatives = [child for child in relatives if is_type(scene.nodes[child].type, node_type)]
+        found.extend(relatives)
+    found = list(dict.fromkeys(found))
+    return found or None
+
+
+def listHistory(*args, **kwargs):
+    history = []
+    for name in _targets(args):
+        shapes = [name] + (listRelatives(name, shapes=True) or [])
+        history.append(name)
+        for skin in ls(type='skinCluster'):
+            if any(shape in scene.nodes[skin].attrs.get('geometry', []) for shape in shapes):
+                history.append(skin)
+    return history
+
+
+def _points(shape):
+    '''Object space vertex positions of a mesh shape: its own points if it
+    has any, otherwise the corners of its bounding box repeated up to its
+    vertex count'''
+    attrs = scene.nodes[shape].attrs
+    if 'points' in attrs:
+        return attrs['points']
+    low, high = attrs.get('boundingBox', [[-0.5] * 3, [0.5] * 3])
+    corners = [[x, y, z] for x in (low[0], high[0]) for y in (low[1], high[1]) for z in (low[2], high[2])]
+    return [corners[index % 8] for index in range(attrs.get('vertexCount', 8))]
+
+
+def _vertices(component):
+    '''World positions of mesh.vtx[*]'''
+    name = _short(component.split('.')[0])
+    shapes = listRelatives(name, shapes=True) or [name]
+    rotation, position = _world_transform(name)
+    return sum(([a + b for a, b in zip(_apply(point, rotation), position)] for point in _points(shapes[0])), [])
+
+
+@_undoable
+def xform(*args, **kwargs):
+    components = [name for name in _flatten(args) if '.vtx' in name]
+    if components and (kwargs.get('q') or kwargs.get('query')):
+        return sum((_vertices(component) for component in components), [])
+    names = [name for name in _targets(args) if is_type(_node(name).type, 'transform')]
+    world = kwargs.get('ws') or kwargs.get('worldSpace')
+    if kwargs.get('q') or kwargs.get('query'):
+        values = []
+        for name in names:
+            node = scene.nodes[name]
+            if world:
+                rotation, position = _world_transform(name)
+            else:
+                rotation, position = _local_rotation(node), list(node.attrs['translate'])
+            if kwargs.get('piv') or kwargs.get('pivots'):
+                values.extend(position + position)
+            elif kwargs.get('rp') or kwargs.get('rotatePivot') or kwargs.get('t') or kwargs.get('translation'):
+                values.extend(position)
+            elif kwargs.get('m') or kwargs.get('matrix'):
+                values.extend(sum([row + [0.0] for row in rotation], []) + position + [1.0])
+            elif kwargs.get('ro') or kwargs.get('rotation'):
+                values.extend(node.attrs['rotate'])
+        return values
+    translation = kwargs.get('t', kwargs.get('translation'))
+    rotation = kwargs.get('ro', kwargs.get('rotation'))
+    matrix = kwargs.get('m', kwargs.get('matrix'))
+    for name in names:
+        if matrix is not None:
+            translation = list(matrix[12:15])
+            rotation = [list(matrix[0:3]), list(matrix[4:7]), list(matrix[8:11])]
+            if world:
+                # Local rotation = world rotation . inverse(parent world rotation)
+                parent_rotation = _parent_space(name)[0]
+                rotation = _mult(rotation, _transpose(parent_rotation))
+            rotation = _euler_of(rotation)
+        if translation is not None:
+            if world:
+                _set_world(name, list(translation))
+            else:
+                scene.nodes[name].attrs['translate'] = list(translation)
+        if rotation is not None:
+            scene.nodes[name].attrs['rotate'] = list(rotation)
+        scale = kwargs.get('s', kwargs.get('scale'))
+        if scale is not None:
+            scene.nodes[name].attrs['scale'] = list(scale)
+        # Kept but not applied
+        rotate_axis = kwargs.get('ra', kwargs.get('rotateAxis'))
+        if rotate_axis is not None:
+            scene.nodes[name].attrs['rotateAxis'] = list(rotate_axis)
+        pivots = kwargs.get('piv', kwargs.get('pivots'))
+        if pivots is not None:
+            scene.nodes[name].attrs.update(rotatePivot=list(pivots[:3]), scalePivot=list(pivots[:3]))
+
+
+def getAttr(plug, **kwargs):
+    name, attr = plug.split('.', 1)
+    attr = _ALIASES.get(attr, attr)
+    node = _node(name)
+    if attr.endswith(('X', 'Y', 'Z')) and attr[:-1] in _VECTORS:
+        return node.attrs[attr[:-1]]['XYZ'.index(attr[-1])]
+    if attr == 'cv[*]':
+        return [tuple(cv) for cv in node.attrs.get('cvs', [])]
+    value = node.attrs.get(attr, 0)
+    if isinstance(value, list) and attr in _VECTORS:
+        return [tuple(value)]
+    return value
+
+
+def polyEvaluate(*args, **kwargs):
+    name = _targets(args)[0]
+    shapes = listRelatives(name, shapes=True) or [name]
+    attrs = scene.nodes[shapes[0]].attrs
+    return len(attrs['points']) if 'points' in attrs else attrs.get('vertexCount', 8)
+
+
+def exactWorldBoundingBox(*args, **kwargs):
+    names = _targets(args)
+    boxes = []
+    for name in names:
+        shapes = listRelatives(name, shapes=True) or [name]
+        points = _points(shapes[0])
+        low = [min(point[axis] for point in points) for axis in range(3)]
+        high = [max(point[axis] for point in points) for axis in range(3)]
+        position = _world(name)
+        boxes.append([p + l for p, l in zip(position, low)] + [p + h for p, h in zip(position, high)])
+    return [min(box[i] for box in boxes) for i in range(3)] + [max(box[i] for box in boxes) for i in range(3, 6)]
+
+
+# -----------------------------------------------------------------------------
+# Selection
+
+@_undoable
+def select(*args, **kwargs):
+    if kwargs.get('cl') or kwargs.get('clear'):
+        scene.selection = []
+        return
+    names = _match(_flatten(args))
+    if kwargs.get('hi') or kwargs.get('hierarchy'):
+        names = list(dict.fromkeys(sum([[name] + _descendants(name) for name in names], [])))
+    if kwargs.get('d') or kwargs.get('deselect'):
+        scene.selection = [name for name in scene.selection if name not in names]
+    elif kwargs.get('add') or kwargs.get('af'):
+        scene.selection = list(dict.fromkeys(scene.selection + names))
+    else:
+        scene.selection = names
+
+
+# -----------------------------------------------------------------------------
+# Node creation and editing
+
+@_undoable
+def createNode(node_type, **kwargs):
+    parent = kwargs.get('parent', kwargs.get('p'))
+    return scene.create(kwargs.get('name', kwargs.get('n')), node_type, _short(parent) if parent else None)
+
+
+@_undoable
+def group(*args, **kwargs):
+    name = scene.create(kwargs.get('name', kwargs.get('n', 'group1')), 'transform')
+    if not (kwargs.get('empty') or kwargs.get('em')):
+        for child in _targets(args):
+            _reparent(child, name)
+    scene.selection = [name]
+    return name
+
+
+@_undoable
+def joint(*args, **kwargs):
+    if kwargs.get('e') or kwargs.get('edit'):
+        for name in _targets(args):
+            if 'orientation' in kwargs or 'o' in kwargs:
+                scene.nodes[name].attrs['jointOrient'] = list(kwargs.get('orientation', kwargs.get('o')))
+        return
+    selected = [name for name in scene.selection if scene.nodes[name].type == 'joint']
+    parent = selected[-1] if selected else None
+    name = scene.create(kwargs.get('n', kwargs.get('name', 'joint1')), 'joint', parent)
+    position = kwargs.get('p', kwargs.get('position'))
+    if position is not None:
+        _set_world(name, list(position))
+    scene.nodes[name].attrs['radius'] = kwargs.get('rad', kwargs.get('radius', 1.0))
+    scene.selection = [name]
+    return name
+
+
+@_undoable
+def move(*args, **kwargs):
+    values = [value for value in args if isinstance(value, (int, float))]
+    names = _targets([arg for arg in args if not isinstance(arg, (int, float))])
+    for name in names:
+        node = scene.nodes[name]
+        if not values:
+            # Axis flags without values, as in move(y=...): drop onto that axis' origin
+            position = _world(name)
+            for index, axis in enumerate('xyz'):
+                if kwargs.get(axis):
+                    position[index] = 0.0
+            _set_world(name, position)
+        elif kwargs.get('os') or kwargs.get('objectSpace'):
+            node.attrs['translate'] = list(values)
+        elif kwargs.get('r') or kwargs.get('relative'):
+            node.attrs['translate'] = [a + b for a, b in zip(node.attrs['translate'], values)]
+        else:
+            _set_world(name, list(values))
+
+
+@_undoable
+def parent(*args, **kwargs):
+    names = [_short(name) for name in _flatten(args)]
+    if kwargs.get('w') or kwargs.get('world'):
+        children, new_parent = names or list(scene.selection), None
+    else:
+        if len(names) < 2:
+            names = list(scene.selection)
+        children, new_parent = names[:-1], names[-1]
+        _node(new_parent)
+    for child in children:
+        if _node(child).parent == new_parent:
+            raise RuntimeError("Object %s is already a child of the given parent." % child)
+        _reparent(child, new_parent, relative=kwargs.get('r') or kwargs.get('relative'))
+    return children
+
+
+@_undoable
+def makeIdentity(*args, **kwargs):
+    for name in _targets(args):
+        node = scene.nodes[name]
+        if 'translate' not in node.attrs:
+            continue
+        if kwargs.get('t') or kwargs.get('translate'):
+            offset = node.attrs['translate']
+            for child in node.children:
+                if 'translate' in scene.nodes[child].attrs:
+                    child_attrs = scene.nodes[child].attrs
+                    child_attrs['translate'] = [a + b for a, b in zip(child_attrs['translate'], offset)]
+            node.attrs['translate'] = [0.0, 0.0, 0.0]
+        if kwargs.get('r') or kwargs.get('rotate'):
+            node.attrs['rotate'] = [0.0, 0.0, 0.0]
+        if kwargs.get('s') or kwargs.get('scale'):
+            node.attrs['scale'] = [1.0, 1.0, 1.0]
+
+
+def _create_shape(name, shape_type, **attrs):
+    transform = scene.create(name, 'transform')
+    shape = scene.create(transform + 'Shape', shape_type, transform)
+    scene.nodes[shape].attrs.update(attrs)
+    scene.selection = [transform]
+    return transform, shape
+
+
+def _circle_cvs(normal, radius, sections=8):
+    '''CVs of a periodic degree 3 circle around normal, as Maya places them'''
+    length = math.sqrt(sum(value * value for value in normal)) or 1.0
+    n = [value / length for value in normal]
+    reference = [1.0, 0.0, 0.0] if abs(n[0]) < 0.9 else [0.0, 1.0, 0.0]
+    u = [n[1] * reference[2] - n[2] * reference[1], n[2] * reference[0] - n[0] * reference[2],
+        n[0] * reference[1] - n[1] * reference[0]]
+    u_length = math.sqrt(sum(value * value for value in u))
+    u = [value / u_length for value in u]
+    v = [n[1] * u[2] - n[2] * u[1], n[2] * u[0] - n[0] * u[2], n[0] * u[1] - n[1] * u[0]]
+    # Cubic CVs sit slightly outside the circle they approximate
+    scale = radius * 1.108194
+    cvs = []
+    for i in range(sections):
+        angle = 2.0 * math.pi * i / sections - math.pi / 4.0
+        cvs.append([scale * (math.cos(angle) * a + math.sin(angle) * b) for a, b in zip(u, v)])
+    return cvs
+
+
+@_undoable
+def circle(*args, **kwargs):
+    normal = list(kwargs.get('nr', (0, 0, 1)))
+    radius = kwargs.get('r', 1.0)
+    transform, shape = _create_shape(kwargs.get('n', kwargs.get('name', 'nurbsCircle1')), 'nurbsCurve',
+        normal=normal, radius=radius, cvs=_circle_cvs(normal, radius), degree=3, spans=8, form=2)
+    if not kwargs.get('ch', kwargs.get('constructionHistory', True)):
+        return [transform]
+    maker = scene.create('makeNurbCircle1', 'makeNurbCircle')
+    return [transform, maker]
+
+
+@_undoable
+def curve(*args, **kwargs):
+    points = kwargs.get('p', kwargs.get('point', []))
+    degree = kwargs.get('d', kwargs.get('degree', 3))
+    periodic = kwargs.get('per', kwargs.get('periodic', False))
+    transform, shape = _create_shape(kwargs.get('n', kwargs.get('name', 'curve1')), 'nurbsCurve',
+        cvs=[list(point) for point in points], degree=degree, spans=len(points) - degree,
+        form=2 if periodic else 0)
+    return transform
+
+
+@_undoable
+def spaceLocator(*args, **kwargs):
+    transform, shape = _create_shape(kwargs.get('n', kwargs.get('name', 'locator1')), 'locator')
+    return [transform]
+
+
+@_undoable
+def polyCube(*args, **kwargs):
+    sx, sy, sz = (kwargs.get(axis, 1) for axis in ('sx', 'sy', 'sz'))
+    vertices = 2 * ((sx + 1) * (sy + 1) + (sx + 1) * (sz + 1) + (sy + 1) * (sz + 1)) - 4 * (sx + sy + sz + 3) + 8
+    transform, shape = _create_shape(kwargs.get('n', kwargs.get('name', 'pCube1')), 'mesh', vertexCount=vertices)
+    return [transform]
+
+
+@_undoable
+def polyUnite(*args, **kwargs):
+    '''Merges the meshes into a new one at the origin. Without construction
+    history the originals are deleted, as in Maya'''
+    names = _targets(args)
+    points = []
+    for name in names:
+        vertices = _vertices(name + '.vtx[*]')
+        points.extend(vertices[index:index + 3] for index in range(0, len(vertices), 3))
+    transform, shape = _create_shape(kwargs.get('n', kwargs.get('name', 'polySurface1')), 'mesh', points=points)
+    if not kwargs.get('ch', kwargs.get('constructionHistory', True)):
+        delete.__wrapped__(names)
+        scene.selection = [transform]
+        return [transform]
+    return [transform, scene.create('polyUnite1', 'polyUnite')]
+
+
+def _constraint(constraint_type, args, kwargs):
+    names = [name for name in _targets(args) if is_type(scene.nodes[name].type, 'transform')]
+    constrained = names[-1]
+    # Like Maya, constraining a node again adds the targets to its existing constraint
+    for child in scene.nodes[constrained].children:
+        if scene.nodes[child].type == constraint_type:
+            targets = scene.nodes[child].attrs['targets']
+            targets.extend(target for target in names[:-1] if target not in targets)
+            return [child]
+    name = scene.create('%s_%s1' % (constrained, constraint_type), constraint_type, constrained)
+    scene.nodes[name].attrs['targets'] = names[:-1]
+    return [name]
+
+
+@_undoable
+def parentConstraint(*args, **kwargs):
+    return _constraint('parentConstraint', args, kwargs)
+
+
+@_undoable
+def orientConstraint(*args, **kwargs):
+    return _constraint('orientConstraint', args, kwargs)
+
+
+@_undoable
+def aimConstraint(*args, **kwargs):
+    return _constraint('aimConstraint', args, kwargs)
+
+
+@_undoable
+def skinCluster(*args, **kwargs):
+    if kwargs.get('q') or kwargs.get('query'):
+        node = _node(_flatten(args)[0])
+        if kwargs.get('g') or kwargs.get('geometry'):
+            return list(node.attrs.get('geometry', []))
+        if kwargs.get('inf') or kwargs.get('influence'):
+            return list(node.attrs.get('influences', []))
+        return None
+    if kwargs.get('e') or kwargs.get('edit'):
+        if kwargs.get('ub') or kwargs.get('unbind'):
+            for name in listHistory(*args):
+                if scene.nodes[name].type == 'skinCluster':
+                    # Part of the unbind's own undo entry
+                    delete.__wrapped__(name)
+        return None
+    names = [_short(name) for name in _flatten(args)]
+    influences = [name for name in names if scene.nodes[name].type == 'joint']
+    geometry = []
+    for name in names:
+        if name not in influences:
+            geometry.extend(listRelatives(name, shapes=True) or [name])
+    name = scene.create(kwargs.get('n', kwargs.get('name', 'skinCluster1')), 'skinCluster')
+    scene.nodes[name].attrs.update(geometry=geometry, influences=influences)
+    return [name]
+
+
+def set_skin_weights(skinCluster, mesh, influences, weights):
+    '''Stores a (vertices x influences) weight matrix on a skinCluster. Not a
+    Maya command: stands in for the API call combinedSkin makes'''
+    node = _node(skinCluster)
+    weights = [list(map(float, row)) for row in weights]
+    if len(weights) != polyEvaluate(mesh):
+        raise RuntimeError("%s has %d vertices, got weights for %d" % (mesh, polyEvaluate(mesh), len(weights)))
+    node.attrs['weights'] = {influence: [row[column] for row in weights] for column, influence in enumerate(influences)}
+
+
+@_undoable
+def delete(*args, **kwargs):
+    names = _match(_flatten(args)) if args else list(scene.selection)
+    for name in names:
+        if name not in scene.nodes:
+            continue
+        meshes = False
+        for doomed in [name] + _descendants(name):
+            node = scene.nodes.pop(doomed)
+            meshes = meshes or node.type == 'mesh'
+            if node.parent in scene.nodes:
+                scene.nodes[node.parent].children.remove(doomed)
+        scene.selection = [sel for sel in scene.selection if sel in scene.nodes]
+        # Deformers go with the last geometry they deform
+        for skin in ls(type='skinCluster') if meshes else []:
+            geometry = scene.nodes[skin].attrs.get('geometry', [])
+            if geometry and not any(shape in scene.nodes for shape in geometry):
+                del scene.nodes[skin]
+        scene.connections = [(src, dst) for src, dst in scene.connections
+            if src.split('.')[0] in scene.nodes and dst.split('.')[0] in scene.nodes]
+        scene.inputs = {dst: src for src, dst in scene.connections}
+
+
+@_undoable
+def rename(*args, **kwargs):
+    old, new = (args if len(args) == 2 else (scene.selection[0], args[0]))
+    node = _node(old)
+    new = scene.unique_name(new)
+    del scene.nodes[node.name]
+    node.name = new
+    scene.nodes[new] = node
+    if node.parent is not None:
+        siblings = scene.nodes[node.parent].children
+        siblings[siblings.index(old)] = new
+    for child in node.children:
+        scene.nodes[child].parent = new
+    scene.selection = [new if sel == old else sel for sel in scene.selection]
+    return new
+
+
+@_undoable
+def setAttr(plug, *values, **kwargs):
+    name, attr = plug.split('.', 1)
+    attr = _ALIASES.get(attr, attr)
+    node = _node(name)
+    if attr.endswith(('X', 'Y', 'Z')) and attr[:-1] in _VECTORS:
+        node.attrs[attr[:-1]]['XYZ'.index(attr[-1])] = values[0]
+    elif len(values) == 1 and kwargs.get('type') not in ('matrix', 'doubleArray'):
+        node.attrs[attr] = values[0]
+    else:
+        node.attrs[attr] = list(values)
+
+
+@_undoable
+def addAttr(*args, **kwargs):
+    for name in _targets(args):
+        attr = kwargs.get('longName', kwargs.get('ln'))
+        default = kwargs.get('defaultValue', kwargs.get('dv', 0))
+        scene.nodes[name].attrs[attr] = None if kwargs.get('dataType', kwargs.get('dt')) else default
+
+
+@_undoable
+def connectAttr(source, destination, **kwargs):
+    _node(source.split('.')[0])
+    _node(destination.split('.')[0])
+    source, destination = _plug(source), _plug(destination)
+    scene.connections.append((source, destination))
+    scene.inputs[destination] = source
+
+
+@_undoable
+def transformLimits(*args, **kwargs):
+    for name in _targets(args):
+        scene.nodes[name].attrs.setdefault('limits', {}).update(kwargs)
+
+
+@_undoable
+def bakePartialHistory(*args, **kwargs):
+    return [] if kwargs.get('query') or kwargs.get('q') else None
+
+
+# -----------------------------------------------------------------------------
+# UI and scene management
+
+def confirmDialog(**kwargs):
+    return kwargs.get('defaultButton', kwargs.get('dismissString', 'OK'))
+
+
+def warning(message):
+    print("Warning: %s" % message)
+
+
+def undoInfo(**kwargs):
+    if kwargs.get('q') or kwargs.get('query'):
+        return scene.undo
+    if kwargs.get('openChunk'):
+        # The whole chunk is one entry
+        if scene.undo and not scene.chunks:
+            scene.undo_queue += 1
+        scene.chunks += 1
+    elif kwargs.get('closeChunk'):
+        scene.chunks = max(0, scene.chunks - 1)
+    if 'state' in kwargs or 'stateWithoutFlush' in kwargs:
+        scene.undo = bool(kwargs.get('state', kwargs.get('stateWithoutFlush')))
+        if 'state' in kwargs and not scene.undo:
+            # Turning undo off with state flushes the queue
+            scene.undo_queue = 0
+
+
+def undo_queue():
+    '''Number of entries in the undo queue. Not a Maya command'''
+    return scene.undo_queue
+
+
+def refresh(**kwargs):
+    pass
+
+
+def file(*args, **kwargs):
+    global scene
+    if kwargs.get('q') or kwargs.get('query'):
+        return scene.file_name
+    if kwargs.get('new') or kwargs.get('n'):
+        scene = Scene()
+        return ''
+    if kwargs.get('rename') or kwargs.get('rn'):
+        scene.file_name = kwargs.get('rename', kwargs.get('rn'))
+        return scene.file_name
+    if kwargs.get('save') or kwargs.get('s'):
+        data = {
+            'nodes': [{'name': node.name, 'type': node.type, 'parent': node.parent, 'attrs': node.attrs}
+                for node in scene.nodes.values()],
+            'connections': scene.connections,
+        }
+        with open(scene.file_name, 'w') as handle:
+            json.dump(data, handle)
+        return scene.file_name
+    if kwargs.get('open') or kwargs.get('o'):
+        with open(args[0]) as handle:
+            data = json.load(handle)
+        scene = Scene()
+        for item in data['nodes']:
+            node = Node(item['name'], item['type'], item['parent'])
+            node.attrs = item['attrs']
+            scene.nodes[node.name] = node
+        for node in scene.nodes.values():
+            if node.parent is not None:
+                scene.nodes[node.parent].children.append(node.name)
+        scene.connections = [tuple(pair) for pair in data.get('connections', [])]
+        scene.inputs = {dst: src for src, dst in scene.connections}
+        scene.file_name = args[0]
+        return args[0]
+
+
+def evalMel(command):
+    '''Stand-in for maya.mel.eval'''
+    if 'gMainWindow' in command:
+        return 'MayaWindow'
+    return ''
+
+
+# Stand-in for the maya.mel module
+mel = types.SimpleNamespace(eval=evalMel)
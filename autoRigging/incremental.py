@@ -0,0 +1,226 @@
+'''Incremental rebuilds.
+
+Every incremental build stores a fingerprint of each body part (world
+pivot, world bounding box and vertex count) as JSON on jnt_grp. When build_rig runs on a
+character that is already rigged, the meshes are compared with the stored
+fingerprint and only the joints, controls, offset groups and skin bindings
+of the parts that changed, or whose joints move or turn because of them,
+are rebuilt. Everything else is kept.
+
+A rig whose parts were added or removed, or that was built with other
+options, is torn down and built again from scratch. Matrix rigs and LOD
+rigs are always rebuilt in full. Combined-skin rigs can't be updated since their pieces
+were merged into one mesh.
+'''
+import json
+
+import numpy as np
+
+from . import orient, placement
+from .backend import cmds
+from .skeletonTemplate import STOCK
+
+ATTR = 'rigFingerprint'
+VERSION = 1
+DIGITS = 4          # decimals positions are compared at
+TOLERANCE = 1e-4
+
+# Build options a rig is tied to, and the values of those older rigs were built without
+OPTIONS = ('combine_skin', 'matrix_rig', 'joint_placement', 'skeleton', 'mirror', 'lod')
+DEFAULTS = {'skeleton': STOCK.spec, 'mirror': False, 'lod': []}
+
+# update() results
+CURRENT = 'current'     # nothing changed
+UPDATED = 'updated'     # changed parts were rebuilt
+FULL = 'full'           # a full build is needed: no fingerprint, or the rig was torn down
+STOPPED = 'stopped'     # the rig can't be updated
+
+
+def _rounded(values):
+    # Adding 0.0 turns -0.0 into 0.0 so both compare equal
+    return (np.round(np.asarray(values, dtype=float), DIGITS) + 0.0).tolist()
+
+
+def fingerprint(plan):
+    '''Fingerprint of every body mesh of a plan, mesh -> part fingerprint.
+    The values are exact, so placement can use them as they are'''
+    meshes = list(plan.meshes)
+    pivots = placement.mesh_positions(meshes, placement.PIVOT)
+    parts = {}
+    for mesh, pivot in zip(meshes, pivots):
+        parts[mesh] = {
+            'pivot': pivot.tolist(),
+            'bbox': list(cmds.exactWorldBoundingBox(mesh)),
+            'vertices': cmds.polyEvaluate(mesh, vertex=True),
+        }
+    return parts
+
+
+def rounded(parts):
+    '''A fingerprint with its positions rounded to DIGITS decimals, as it is
+    stored and compared'''
+    return {mesh: dict(part, pivot=_rounded(part['pivot']), bbox=_rounded(part['bbox']))
+        for mesh, part in parts.items()}
+
+
+def store(plan, options, parts=None):
+    '''Writes the fingerprint and build options onto the rig's jnt_grp'''
+    data = {
+        'version': VERSION,
+        'options': {name: options[name] for name in OPTIONS},
+        'parts': rounded(parts if parts is not None else fingerprint(plan)),
+    }
+    plug = plan.jnt_grp + '.' + ATTR
+    if not cmds.objExists(plug):
+        cmds.addAttr(plan.jnt_grp, longName=ATTR, dataType='string')
+    cmds.setAttr(plug, json.dumps(data, sort_keys=True), type='string')
+
+
+def stored(plan):
+    '''The fingerprint stored on the rig, or None when there isn't one'''
+    plug = plan.jnt_grp + '.' + ATTR
+    if not cmds.objExists(plug):
+        return None
+    data = json.loads(cmds.getAttr(plug) or '{}')
+    if data.get('version') != VERSION:
+        return None
+    data['options'] = dict(DEFAULTS, **data['options'])
+    return data
+
+
+def diff(old, new):
+    '''Returns the (added, removed, changed) meshes between two fingerprints'''
+    old, new = rounded(old), rounded(new)
+    added = [mesh for mesh in new if mesh not in old]
+    removed = [mesh for mesh in old if mesh not in new]
+    changed = [mesh for mesh in new if mesh in old and new[mesh] != old[mesh]]
+    return added, removed, changed
+
+
+class IncrementalRebuild:
+    '''Brings an existing rig up to date with its body meshes'''
+    def __init__(self, plan, options, interactive=True):
+        self.plan = plan
+        self.options = {name: options[name] for name in OPTIONS}
+        self.interactive = interactive
+        self.parts = fingerprint(plan)
+
+    def update(self):
+        '''Returns CURRENT, UPDATED, FULL or STOPPED'''
+        from .autoRigger import warning_dialog
+        data = stored(self.plan)
+        if data is None:
+            return FULL
+        foreign = [mesh for mesh in data['parts'] if not self.plan.belongs(mesh)]
+        if foreign:
+            # Never tear down a rig that isn't this character's
+            warning_dialog("%s holds the rig of another character (%s). Please rename or remove it to rig %s."
+                % (self.plan.jnt_grp, foreign[0], ", ".join(sorted(self.plan.prefixes))), self.interactive)
+            return STOPPED
+        if data['options'].get('combine_skin'):
+            warning_dialog("This rig was built with a combined skin and can't be updated. "
+                "Please remove it to rebuild.", self.interactive)
+            return STOPPED
+        added, removed, changed = diff(data['parts'], self.parts)
+        full = self.options['matrix_rig'] or self.options['lod']
+        if data['options'] != self.options or added or removed or (changed and full):
+            print("Rebuilding the whole rig.")
+            self.teardown(data)
+            return FULL
+        if not changed:
+            print("Rig is up to date.")
+            return CURRENT
+        self.rebuild(changed)
+        store(self.plan, self.options, self.parts)
+        return UPDATED
+
+    def teardown(self, data):
+        '''Unbinds the meshes and deletes the joints and controls of a rig'''
+        from .autoRigger import SkinningRig
+        plan = self.plan
+        meshes = set(data['parts']) | set(plan.meshes)
+        for mesh in SkinningRig(plan).find_skinned_meshes() & meshes:
+            cmds.skinCluster(mesh, e=True, ub=True)
+        # Matrix rigs drive every joint through a multMatrix named after the control
+        controls = [mesh + '_ctrl' for mesh in data['parts']] + [plan.offset_ctrl]
+        doomed = [ctrl.replace('_ctrl', '_multMatrix') for ctrl in controls]
+        doomed += [plan.ctrl_grp, plan.main_ctrl, plan.jnt_grp]
+        doomed = [node for node in doomed if cmds.objExists(node)]
+        if doomed:
+            cmds.delete(doomed)
+
+    def moving_joints(self, joints, parents, modes, layout):
+        '''Joints whose world position or orientation changes with the new layout'''
+        old = np.array(cmds.xform(joints, q=True, t=True, ws=True), dtype=float).reshape(-1, 3)
+        new = np.array([layout[joint] for joint in joints], dtype=float)
+        old_world = orient.orient_skeleton(joints, old, parents, modes)
+        new_world = orient.orient_skeleton(joints, new, parents, modes)
+        moved = np.abs(new - old).max(axis=1) > TOLERANCE
+        turned = np.abs(new_world - old_world).reshape(-1, 9).max(axis=1) > TOLERANCE
+        return {joint for joint, dirty in zip(joints, moved | turned) if dirty}, new, new_world
+
+    def rebuild(self, changed):
+        '''Rebuilds the parts of the changed meshes and of the joints they move'''
+        from . import controlShapes, mirror
+        from .autoRigger import ControlRig, JointHierarchy, OffsetGroup, SkelCreator, SkinningRig
+        plan = self.plan
+        sides = mirror.mirrored_sides(plan, self.parts, self.options['joint_placement']) if self.options['mirror'] else None
+        skelCreator = SkelCreator(plan, self.interactive, placement=self.options['joint_placement'], mirror=sides,
+            parts=self.parts)
+        layout = {name: position for name, parent, position in skelCreator.joint_layout()}
+        joints, parents, modes = JointHierarchy(plan).skeleton()
+        moving, positions, world = self.moving_joints(joints, parents, modes, layout)
+        # Controlled joints right below a moving one are rebuilt as well, so
+        # nothing relies on their constraint holding them while it moves
+        driven = set(plan.controls.values())
+        dirty = moving | {joint for joint in joints if joint in driven and parents.get(joint) in moving}
+
+        controls = {ctrl: joint for ctrl, joint in plan.controls.items() if joint in dirty}
+        rebind = [mesh for mesh, joint in plan.skin.items() if mesh in changed or joint in moving]
+
+        skinningRig = SkinningRig(plan)
+        skinned = skinningRig.find_skinned_meshes()
+        for mesh in rebind:
+            if mesh in skinned:
+                cmds.skinCluster(mesh, e=True, ub=True)
+
+        # Take out the controls of moving joints, keeping the offset groups of
+        # the controls below them that stay
+        dirty_offsets = [plan.offsets[ctrl] for ctrl in controls]
+        orphans = [offset for offset, parent in plan.control_parents.items()
+            if parent in controls and offset not in dirty_offsets]
+        if orphans:
+            cmds.parent(orphans, world=True)
+        for joint in controls.values():
+            constraints = cmds.listRelatives(joint, type='parentConstraint')
+            if constraints:
+                cmds.delete(constraints)
+        if dirty_offsets:
+            cmds.delete(dirty_offsets)
+
+        # Joints still held by a control keep their place through the
+        # constraint, the others get their new local translation
+        constrained = (driven - dirty) | {plan.root}
+        translate, joint_orient = orient.local_transforms(joints, positions, parents, world)
+        for i, joint in enumerate(joints):
+            if joint not in dirty and parents.get(joint) not in dirty:
+                continue
+            if joint not in constrained:
+                cmds.setAttr(joint + '.translate', *translate[i].tolist())
+                cmds.setAttr(joint + '.rotate', 0, 0, 0)
+            cmds.setAttr(joint + '.jointOrient', *joint_orient[i].tolist())
+
+        controlRig = ControlRig(plan, interactive=self.interactive)
+        offsetGroup = OffsetGroup(plan)
+        for ctrl, joint in controls.items():
+            controlRig.create_control(ctrl, joint)
+        offsetGroup.offset_controls(list(controls))
+        controlShapes.lock_translation(controls)
+        for offset in orphans:
+            cmds.parent(offset, plan.control_parents[offset])
+
+        for mesh in rebind:
+            skinningRig.bind(mesh, plan.skin[mesh])
+        skinningRig.constrain_controls(controls)
+        print(f"Rebuilt {len(moving)} joints, {len(controls)} controls and {len(rebind)} skin bindings "
+            f"for {len(changed)} changed meshes.")
@@ -0,0 +1,129 @@
+'''LOD rig variants.
+
+A lighter rig for crowd agents, built from the same body meshes: the joints
+of the parts matching an LOD's role patterns are dropped, the meshes bound
+to them are bound to their nearest surviving ancestor instead and their
+controls and offset groups are never made.
+
+The skeleton is still built and oriented in full, and the dropped joints
+are only taken out after orientation, with their surviving children moved
+up to the nearest surviving ancestor. The joints an LOD keeps therefore
+get the same placement and orientation as in the full rig, and animation
+made for one LOD plays on the others.
+
+    build_rig(meshes, lod='lod1')                           # a preset
+    build_rig(meshes, lod=['Finger*', 'Thumb*'])            # role patterns
+    counts(plan)        # joints, deformers and DG nodes the rig will have
+'''
+import fnmatch
+
+from .backend import cmds
+
+# Role patterns each preset drops, matched with fnmatch
+LODS = {
+    'lod0': (),
+    'lod1': ('Thumb*', 'Finger*', 'ForearmTwist*'),
+    'lod2': ('Thumb*', 'Finger*', 'ForearmTwist*', 'Midsection_*', 'Hand_*', 'Foot_*'),
+}
+
+
+def patterns(lod):
+    '''Role patterns of an LOD given by preset name or as patterns, sorted
+    so they can be stored and compared'''
+    if not lod:
+        return []
+    if isinstance(lod, str):
+        if lod not in LODS:
+            raise ValueError("Unknown LOD %r, expected one of %s or a list of role patterns" % (lod, ", ".join(LODS)))
+        lod = LODS[lod]
+    return sorted(set(lod))
+
+
+def reduce(plan, lod):
+    '''Drops the parts of a plan whose role matches one of the LOD's
+    patterns: their controls and offset groups go, offset groups under a
+    dropped control go under the nearest surviving one and their meshes are
+    bound to the nearest surviving ancestor joint. The joints themselves
+    stay in the plan until prune() takes them out of the built skeleton.
+    Returns the plan'''
+    lod = patterns(lod)
+    roles = [role for role in plan.joints if any(fnmatch.fnmatchcase(role, pattern) for pattern in lod)]
+    if not roles:
+        return plan
+    doomed = {plan.joints[role] for role in roles}
+    for role in roles:
+        doomed.update(plan.feet.get(plan.parts[role], ()))
+
+    def survivor(joint):
+        while joint in doomed:
+            joint = plan.joint_parents.get(joint, plan.root)
+        return joint
+
+    plan.dropped = {joint: survivor(joint) for joint in doomed}
+    dropped_controls = {ctrl for ctrl, joint in plan.controls.items() if joint in doomed}
+    ctrl_parents = {ctrl: plan.control_parents.get(offset) for ctrl, offset in plan.offsets.items()}
+
+    def control_survivor(ctrl):
+        while ctrl in dropped_controls:
+            ctrl = ctrl_parents.get(ctrl)
+        return ctrl
+
+    for ctrl in dropped_controls:
+        del plan.controls[ctrl]
+        del plan.control_parents[plan.offsets.pop(ctrl)]
+    for offset, parent in list(plan.control_parents.items()):
+        plan.control_parents[offset] = control_survivor(parent)
+    plan.skin = {mesh: survivor(joint) for mesh, joint in plan.skin.items()}
+    return plan
+
+
+def prune(plan):
+    '''Takes the dropped joints out of a built and oriented skeleton. Their
+    surviving children are moved to the nearest surviving ancestor, keeping
+    their world placement, and the plan's joint tables are brought in line'''
+    if not plan.dropped:
+        return
+    dropped = plan.dropped
+    moved = {}
+    for child, parent in plan.joint_parents.items():
+        if child not in dropped and parent in dropped:
+            moved.setdefault(dropped[parent], []).append(child)
+    for ancestor, children in moved.items():
+        cmds.parent(children, ancestor)
+    cmds.delete(list(dropped))
+
+    plan.joint_parents = {child: dropped.get(parent, parent) for child, parent in plan.joint_parents.items()
+        if child not in dropped}
+    plan.joints = {role: joint for role, joint in plan.joints.items() if joint not in dropped}
+    plan.feet = {mesh: joints for mesh, joints in plan.feet.items() if joints[0] not in dropped}
+    print(f"Dropped {len(dropped)} joints for the LOD.")
+
+
+def counts(plan, matrix_rig=False, combine_skin=False):
+    '''Joints, controls, deformers and rigging DG nodes the plan's rig has
+    per character, once its dropped joints are gone. DG nodes counts the
+    nodes the rigger makes: joints, controls and their shapes, offset
+    groups, constraints or multMatrix nodes, skinClusters and the two top
+    groups. Maya adds a few helper nodes of its own to every skinCluster'''
+    joints = len([joint for joint in plan.all_joints() if joint not in plan.dropped])
+    controls = len(plan.controls) + 2
+    deformers = 1 if combine_skin else len(plan.skin)
+    # One constraint or multMatrix per driven joint, root_jnt included. Both
+    # rigs constrain the same pairs, which Maya folds into one constraint, and
+    # the constraint build adds an _offset per control, ctrl_grp and offset_grp
+    driven = len(plan.controls) + 1
+    wiring = driven if matrix_rig else driven + len(plan.controls) + 2
+    return {
+        'joints': joints,
+        'controls': controls,
+        'deformers': deformers,
+        'dg nodes': joints + 2 * controls + wiring + deformers + 2,
+    }
+
+
+def report(plans, matrix_rig=False, combine_skin=False):
+    '''Prints counts() for plans given as LOD name -> plan'''
+    print(f"{'lod':<10}{'joints':>8}{'controls':>10}{'deformers':>11}{'dg nodes':>10}")
+    for name, plan in plans.items():
+        entry = counts(plan, matrix_rig, combine_skin)
+        print(f"{name:<10}{entry['joints']:>8}{entry['controls']:>10}{entry['deformers']:>11}{entry['dg nodes']:>10}")
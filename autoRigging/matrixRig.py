@@ -0,0 +1,82 @@
+'''Constraint-free build mode.
+
+Instead of a parentConstraint per control (made by ControlRig, and again by
+SkinningRig onto the same node) and an _offset transform above every
+control, controls keep their rest placement in offsetParentMatrix and drive
+their joint through one multMatrix node:
+
+    ctrl.worldMatrix * jointParent.worldInverseMatrix -> joint.offsetParentMatrix
+
+Needs Maya 2020 or newer for offsetParentMatrix.
+'''
+import numpy as np
+
+from .backend import cmds
+
+
+# Node types the constraint and matrix builds differ in: the constraints,
+# the _offset transforms and the multMatrix nodes
+NODE_TYPES = ('parentConstraint', 'transform', 'multMatrix')
+
+
+def node_counts():
+    '''Nodes of each of NODE_TYPES in the scene'''
+    return {node_type: len(cmds.ls(type=node_type)) for node_type in NODE_TYPES}
+
+
+def report(before, after, characters):
+    '''Prints the nodes of each type a build of characters created, from
+    node_counts() taken before and after it'''
+    created = {node_type: after[node_type] - before[node_type] for node_type in NODE_TYPES}
+    print(f"{'node type':<20}{'created':>9}{'per character':>15}")
+    for node_type, count in created.items():
+        print(f"{node_type:<20}{count:>9}{count / characters:>15.1f}")
+    return created
+
+
+class MatrixRig:
+    '''Wires the controls to the joints with matrix connections'''
+    def __init__(self, plan):
+        self.plan = plan
+        self.drivers = dict(plan.controls)
+        self.drivers[plan.offset_ctrl] = plan.root
+
+    def world_matrix(self, node):
+        return np.array(cmds.xform(node, q=True, matrix=True, worldSpace=True)).reshape(4, 4)
+
+    def parent_controls(self):
+        '''Builds the control hierarchy, storing each control's rest placement
+        in its offsetParentMatrix instead of an _offset group'''
+        plan = self.plan
+        parents = {ctrl: plan.control_parents.get(offset) for ctrl, offset in plan.offsets.items()}
+        parents[plan.offset_ctrl] = plan.main_ctrl
+        world = {ctrl: self.world_matrix(ctrl) for ctrl in parents}
+        world[plan.main_ctrl] = self.world_matrix(plan.main_ctrl)
+
+        for ctrl, parent in parents.items():
+            if parent is None:
+                continue
+            cmds.parent(ctrl, parent)
+            offset = world[ctrl] @ np.linalg.inv(world[parent])
+            cmds.setAttr(ctrl + '.offsetParentMatrix', *offset.ravel().tolist(), type='matrix')
+            cmds.setAttr(ctrl + '.translate', 0, 0, 0)
+            cmds.setAttr(ctrl + '.rotate', 0, 0, 0)
+            cmds.setAttr(ctrl + '.scale', 1, 1, 1)
+
+    def drive_joints(self):
+        '''Connects every control to its joint through a multMatrix'''
+        plan = self.plan
+        for ctrl, joint in self.drivers.items():
+            parent = plan.joint_parents.get(joint, plan.jnt_grp)
+            mult = cmds.createNode('multMatrix', n=ctrl.replace('_ctrl', '') + '_multMatrix')
+            cmds.connectAttr(ctrl + '.worldMatrix[0]', mult + '.matrixIn[0]')
+            cmds.connectAttr(parent + '.worldInverseMatrix[0]', mult + '.matrixIn[1]')
+            cmds.connectAttr(mult + '.matrixSum', joint + '.offsetParentMatrix')
+            cmds.setAttr(joint + '.translate', 0, 0, 0)
+            cmds.setAttr(joint + '.rotate', 0, 0, 0)
+            cmds.setAttr(joint + '.jointOrient', 0, 0, 0)
+
+    def build(self):
+        self.parent_controls()
+        self.drive_joints()
+        print("Controls wired to joints with matrix connections.")
@@ -0,0 +1,88 @@
+'''Symmetric builds.
+
+When the right side of a character mirrors its left side across a plane
+facing x (the yz plane through the character's middle, wherever it stands),
+the joints of the right side can be placed by mirroring the left side's
+instead of reading their own meshes. The check runs on the part
+fingerprints the build has already read (world pivot, bounding box and
+vertex count), so it costs no scene queries. Centroid placement depends on
+where the vertices are inside the box, so there the check also compares
+the two sides' centroids, read in one xform call. Joint orientation is still
+derived from the positions afterwards, so a mirrored right side orients
+exactly like the left: aimed axes come out reflected, with z turned around
+to keep each frame right handed.
+
+    sides = symmetric(plan, parts, mode)    # (right mesh -> left mesh, plane x) or None
+    if sides:
+        SkelCreator(plan, mirror=sides)
+'''
+import numpy as np
+
+from . import placement
+
+LEFT = '_Left'
+RIGHT = '_Right'
+TOLERANCE = 1e-3        # largest difference, in world units, the sides may have
+
+
+
+def counterparts(plan):
+    '''Right mesh -> left mesh of every part the plan has on both sides'''
+    pairs = {}
+    for role, mesh in plan.parts.items():
+        if role.endswith(RIGHT):
+            left = plan.parts.get(role[:-len(RIGHT)] + LEFT)
+            if left is not None:
+                pairs[mesh] = left
+    return pairs
+
+
+def mirror_points(points, plane=0.0):
+    '''Points reflected across the yz plane at x = plane'''
+    points = np.array(points, dtype=float)
+    points[..., 0] = 2.0 * plane - points[..., 0]
+    return points
+
+
+def mirror_bbox(bbox, plane=0.0):
+    '''World bounding box (xmin, ymin, zmin, xmax, ymax, zmax) reflected
+    across the yz plane at x = plane'''
+    xmin, ymin, zmin, xmax, ymax, zmax = bbox
+    return [2.0 * plane - xmax, ymin, zmin, 2.0 * plane - xmin, ymax, zmax]
+
+
+def symmetric(plan, parts, mode=placement.PIVOT, tolerance=TOLERANCE):
+    '''Returns (right mesh -> left mesh, plane x) when every right part of
+    the plan mirrors its left part across one yz plane within tolerance:
+    same vertex count, mirrored pivot and bounding box, and for the centroid
+    placement mode mirrored centroids. parts is the plan's fingerprint.
+    Returns None when a right part has no left part or the sides differ'''
+    pairs = counterparts(plan)
+    if not pairs or len(pairs) != sum(role.endswith(RIGHT) for role in plan.parts):
+        return None
+    # The plane runs halfway between the sides' pivots
+    plane = float(np.mean([parts[right]['pivot'][0] + parts[left]['pivot'][0] for right, left in pairs.items()])) / 2.0
+    for right, left in pairs.items():
+        a, b = parts[right], parts[left]
+        if a['vertices'] != b['vertices']:
+            return None
+        difference = max(np.abs(mirror_points(b['pivot'], plane) - a['pivot']).max(),
+            np.abs(np.subtract(mirror_bbox(b['bbox'], plane), a['bbox'])).max())
+        if difference > tolerance:
+            return None
+    if mode == placement.CENTROID:
+        rights, lefts = list(pairs), list(pairs.values())
+        centroids = placement.mesh_positions(rights + lefts, mode, parts)
+        if np.abs(mirror_points(centroids[len(rights):], plane) - centroids[:len(rights)]).max() > tolerance:
+            return None
+    return pairs, plane
+
+
+def mirrored_sides(plan, parts, mode=placement.PIVOT, tolerance=TOLERANCE):
+    '''symmetric() for a build, reporting which way the right side is placed'''
+    sides = symmetric(plan, parts, mode, tolerance)
+    if sides is None:
+        print("Left and right sides aren't symmetric, placing each side on its own.")
+    else:
+        print(f"Mirroring {len(sides[0])} right side parts from the left.")
+    return sides
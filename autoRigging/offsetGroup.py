@@ -0,0 +1,18 @@
+from .backend import cmds
+
+# Offset groups of the rig's top controls take the rig's group names
+GROUP_NAMES = {'offset_ctrl': 'offset_grp', 'main_ctrl': 'ctrl_grp'}
+
+def parent_to_group(objects=None):
+    '''Puts each object (the selection by default) under a zeroed offset group'''
+    from . import zeroing
+    sel = cmds.ls(selection=True) if objects is None else objects
+
+    if not sel:
+        cmds.warning("No object selected.")
+        return
+
+    groups = zeroing.zero(sel, names={obj: GROUP_NAMES[obj] for obj in sel if obj in GROUP_NAMES})
+    for obj, group_node in zip(sel, groups):
+        print(f"Parented {obj} to {group_node}")
+    return groups
@@ -0,0 +1,132 @@
+'''Analytic joint orientation.
+
+Computes the orientation of a whole skeleton in one NumPy pass from the
+joint world positions and the parent map, instead of selecting hierarchies
+for orientJoint and creating temporary aimConstraints. Everything here is
+plain maths on arrays, so it runs without Maya.
+
+Matrices follow Maya's convention: rows are the x, y and z axes in world
+space and points are row vectors, so world = local . parentWorld.
+'''
+import numpy as np
+
+UP = np.array([0.0, 1.0, 0.0])
+# Secondary reference when the aim runs along UP, as for a straight spine:
+# z is kept on world z and y ends up pointing down world -x
+FALLBACK = np.array([0.0, 0.0, 1.0])
+
+AIM = 'aim'                     # x to the first child, y up; leaves copy the parent
+WORLD = 'world'                 # aligned with the world axes
+FROM_PARENT = 'fromParent'      # x away from the parent joint, y up
+
+
+def aim_matrices(aims, up=UP):
+    '''Frames whose x axis follows each aim vector and whose y axis leans
+    towards up, as orientJoint xyz with secondaryAxisOrient yup. Returns an
+    (n, 3, 3) array; zero-length aims give the identity'''
+    aims = np.asarray(aims, dtype=float).reshape(-1, 3)
+    length = np.linalg.norm(aims, axis=1)
+    valid = length > 1e-9
+    x = np.where(valid[:, None], aims / np.where(valid, length, 1.0)[:, None], [1.0, 0.0, 0.0])
+    z = np.cross(x, up)
+    z_length = np.linalg.norm(z, axis=1)
+    parallel = z_length < 1e-6
+    # Along the up vector: keep z as close to the fallback axis as possible
+    fallback = FALLBACK - (x @ FALLBACK)[:, None] * x
+    z = np.where(parallel[:, None], fallback, z)
+    z /= np.linalg.norm(z, axis=1)[:, None]
+    y = np.cross(z, x)
+    matrices = np.stack([x, y, z], axis=1)
+    matrices[~valid] = np.eye(3)
+    return matrices
+
+
+def euler_xyz(matrices):
+    '''Rotation order xyz euler angles in degrees of (n, 3, 3) rotations'''
+    m = np.asarray(matrices, dtype=float).reshape(-1, 3, 3)
+    b = np.arcsin(np.clip(-m[:, 0, 2], -1.0, 1.0))
+    gimbal = np.abs(m[:, 0, 2]) > 1.0 - 1e-9
+    a = np.where(gimbal, np.arctan2(-m[:, 2, 1], m[:, 1, 1]), np.arctan2(m[:, 1, 2], m[:, 2, 2]))
+    c = np.where(gimbal, 0.0, np.arctan2(m[:, 0, 1], m[:, 0, 0]))
+    return np.degrees(np.stack([a, b, c], axis=1))
+
+
+def euler_matrices(angles):
+    '''Inverse of euler_xyz: (n, 3) degrees to (n, 3, 3) rotations'''
+    a, b, c = np.radians(np.asarray(angles, dtype=float).reshape(-1, 3)).T
+    ca, sa, cb, sb, cc, sc = np.cos(a), np.sin(a), np.cos(b), np.sin(b), np.cos(c), np.sin(c)
+    return np.stack([
+        np.stack([cb * cc, cb * sc, -sb], axis=1),
+        np.stack([sa * sb * cc - ca * sc, sa * sb * sc + ca * cc, sa * cb], axis=1),
+        np.stack([ca * sb * cc + sa * sc, ca * sb * sc - sa * cc, ca * cb], axis=1),
+    ], axis=1)
+
+
+def hierarchy_order(parents, roots=()):
+    '''Joint names with every parent ahead of its children'''
+    children = {}
+    for child, parent in parents.items():
+        children.setdefault(parent, []).append(child)
+    order, seen = [], set()
+    pending = list(roots) + [parent for parent in children if parent not in parents and parent not in roots]
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        order.append(name)
+        pending.extend(reversed(children.get(name, [])))
+    return order
+
+
+def orient_skeleton(joints, positions, parents, modes):
+    '''World rotations of every joint.
+    joints lists the names with parents first, positions holds their world
+    positions, parents maps a joint to its parent and modes maps a joint to
+    AIM, WORLD or FROM_PARENT (WORLD when missing)'''
+    index = {joint: i for i, joint in enumerate(joints)}
+    positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+    first_child = {}
+    for child, parent in parents.items():
+        first_child.setdefault(parent, child)
+
+    aims = np.zeros_like(positions)
+    aimed = np.zeros(len(joints), dtype=bool)
+    inherit = []
+    for i, joint in enumerate(joints):
+        mode = modes.get(joint, WORLD)
+        if mode == AIM and joint in first_child:
+            aims[i] = positions[index[first_child[joint]]] - positions[i]
+            aimed[i] = True
+        elif mode == AIM and joint in parents:
+            inherit.append(i)
+        elif mode == FROM_PARENT and joint in parents:
+            aims[i] = positions[i] - positions[index[parents[joint]]]
+            aimed[i] = True
+
+    world = np.repeat(np.eye(3)[None], len(joints), axis=0)
+    world[aimed] = aim_matrices(aims[aimed])
+    for i in inherit:
+        world[i] = world[index[parents[joints[i]]]]
+    return world
+
+
+def local_transforms(joints, positions, parents, world):
+    '''Returns the (translate, jointOrient) of every joint that places it at
+    its world position with its world rotation, with rotate left at zero'''
+    index = {joint: i for i, joint in enumerate(joints)}
+    positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+    parent_index = np.array([index.get(parents.get(joint), -1) for joint in joints])
+    has_parent = parent_index >= 0
+    parent_world = np.where(has_parent[:, None, None], world[parent_index], np.eye(3))
+    parent_position = np.where(has_parent[:, None], positions[parent_index], 0.0)
+    # Parents are unscaled, so their inverse rotation is the transpose
+    parent_inverse = np.transpose(parent_world, (0, 2, 1))
+    translate = np.einsum('ni,nij->nj', positions - parent_position, parent_inverse)
+    joint_orient = euler_xyz(np.einsum('nij,njk->nik', world, parent_inverse))
+    return translate, joint_orient
+
+
+def rotated(matrices, tolerance=1e-9):
+    '''Mask of the rotations that differ from the identity'''
+    return np.abs(np.asarray(matrices) - np.eye(3)).reshape(-1, 9).max(axis=1) > tolerance
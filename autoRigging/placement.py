@@ -0,0 +1,58 @@
+'''Joint placement for the skeleton stage.
+
+Reads where every joint goes in one bulk query into a NumPy array, instead
+of one xform round trip per mesh, and derives the foot base and toe joints
+from the foot positions with array operations.
+
+    positions = mesh_positions(meshes, PIVOT)     # (n, 3)
+    bases, toes = foot_positions(positions[feet])
+'''
+import numpy as np
+
+from .backend import cmds
+
+PIVOT = 'pivot'         # the mesh's world pivot, as the rigger always used
+BBOX = 'bbox'           # centre of the world bounding box of the vertices
+CENTROID = 'centroid'   # mean of the world vertex positions
+MODES = (PIVOT, BBOX, CENTROID)
+
+# Offset of the toe joint from the foot base joint
+TOE_OFFSET = np.array([0.0, 0.0, 0.2])
+
+
+def mesh_positions(meshes, mode=PIVOT, parts=None):
+    '''World position of each mesh as an (n, 3) array.
+    Pivots come back from a single xform query. bbox takes the centre of
+    each mesh's world bounding box, and centroid reads the vertices of all
+    the meshes in one xform call and splits them by vertex count. parts, the
+    fingerprint of the meshes, saves reading the bounding boxes and vertex
+    counts again'''
+    if mode not in MODES:
+        raise ValueError("Unknown joint placement %r, expected one of %s" % (mode, ", ".join(MODES)))
+    if not meshes:
+        return np.zeros((0, 3))
+    if mode == PIVOT:
+        # rotatePivot then scalePivot for every mesh
+        return np.array(cmds.xform(meshes, q=True, piv=True, ws=True), dtype=float).reshape(-1, 6)[:, :3]
+    if mode == BBOX:
+        if parts is not None:
+            boxes = np.array([parts[mesh]['bbox'] for mesh in meshes], dtype=float)
+        else:
+            boxes = np.array([cmds.exactWorldBoundingBox(mesh) for mesh in meshes], dtype=float)
+        return (boxes[:, :3] + boxes[:, 3:]) * 0.5
+    if parts is not None:
+        counts = np.array([parts[mesh]['vertices'] for mesh in meshes])
+    else:
+        counts = np.array([cmds.polyEvaluate(mesh, vertex=True) for mesh in meshes])
+    vertices = np.array(cmds.xform([mesh + '.vtx[*]' for mesh in meshes], q=True, t=True, ws=True),
+        dtype=float).reshape(-1, 3)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return np.add.reduceat(vertices, starts, axis=0) / counts[:, None]
+
+
+def foot_positions(feet):
+    '''Returns the (base, toe) positions of feet at the given positions:
+    the base drops onto the ground plane, the toe sits TOE_OFFSET in front'''
+    bases = np.array(feet, dtype=float).reshape(-1, 3)
+    bases[:, 1] = 0.0
+    return bases, bases + TOE_OFFSET
@@ -0,0 +1,118 @@
+'''Opt-in instrumentation for the rigger.
+
+While a RigProfiler is active, every cmds call made through
+autoRigging.backend is counted against the current build stage. Each stage
+also records its wall time and the net number of nodes it left in the
+scene. Works the same with Maya and with the fake backend, so command
+counts can be asserted to catch changes that add scene queries.
+
+    profiler = RigProfiler()
+    build_rig(meshes, profiler=profiler)
+    print(profiler.summary())
+    profiler.to_json()
+'''
+import contextlib
+import json
+import time
+from collections import Counter
+
+from . import backend
+
+
+class CountingCmds:
+    '''Wraps a cmds module and reports every command call to a profiler'''
+    def __init__(self, cmds_module, profiler):
+        self._cmds = cmds_module
+        self._profiler = profiler
+        self._wrapped = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self._cmds, name)
+        if not callable(attr):
+            return attr
+        if name not in self._wrapped:
+            record = self._profiler.record
+            def counted(*args, **kwargs):
+                record(name)
+                return getattr(self._cmds, name)(*args, **kwargs)
+            self._wrapped[name] = counted
+        return self._wrapped[name]
+
+
+class RigProfiler:
+    '''Per-stage wall time, command counts and node counts'''
+    def __init__(self):
+        self.stages = {}
+        self._current = None
+        self._cmds = None
+        self._depth = 0
+
+    def __enter__(self):
+        if self._depth == 0:
+            self._cmds = backend.current()
+            backend.set_backend(CountingCmds(self._cmds, self))
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            backend.set_backend(self._cmds)
+            self._cmds = None
+
+    def _entry(self, name):
+        return self.stages.setdefault(name, {'seconds': 0.0, 'calls': Counter(), 'nodes_created': 0})
+
+    def record(self, command):
+        self._entry(self._current or 'other')['calls'][command] += 1
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        '''Attributes everything done inside the block to the named stage'''
+        with self:
+            entry = self._entry(name)
+            # Counted on the unwrapped backend so the bookkeeping isn't recorded
+            nodes_before = len(self._cmds.ls())
+            previous, self._current = self._current, name
+            start = time.perf_counter()
+            try:
+                yield entry
+            finally:
+                entry['seconds'] += time.perf_counter() - start
+                self._current = previous
+                entry['nodes_created'] += len(self._cmds.ls()) - nodes_before
+
+    def totals(self):
+        calls = Counter()
+        for entry in self.stages.values():
+            calls.update(entry['calls'])
+        return {
+            'seconds': sum(entry['seconds'] for entry in self.stages.values()),
+            'calls': calls,
+            'nodes_created': sum(entry['nodes_created'] for entry in self.stages.values()),
+        }
+
+    def to_dict(self):
+        def plain(entry):
+            return {'seconds': entry['seconds'], 'calls': dict(entry['calls']),
+                'total_calls': sum(entry['calls'].values()), 'nodes_created': entry['nodes_created']}
+        return {'stages': {name: plain(entry) for name, entry in self.stages.items()},
+            'total': plain(self.totals())}
+
+    def to_json(self, path=None, indent=2):
+        '''Returns the profile as JSON, and writes it to path if given'''
+        text = json.dumps(self.to_dict(), indent=indent)
+        if path:
+            with open(path, 'w') as handle:
+                handle.write(text)
+        return text
+
+    def summary(self):
+        '''Readable table of the profile'''
+        lines = [f"{'stage':<14}{'seconds':>10}{'calls':>8}{'nodes':>8}  commands"]
+        rows = list(self.stages.items()) + [('total', self.totals())]
+        for name, entry in rows:
+            commands = ', '.join(f"{command} {count}" for command, count in entry['calls'].most_common())
+            lines.append(f"{name:<14}{entry['seconds']:>10.4f}{sum(entry['calls'].values()):>8}"
+                f"{entry['nodes_created']:>8}  {commands}")
+        return '\n'.join(lines)
@@ -0,0 +1,335 @@
+'''Compact rig files.
+
+export_rig() writes the definition of a finished rig (joints, controls,
+offsets and skin bindings) to one versioned binary file. load_rig() builds
+that rig again straight from the file, without querying the scene for a
+single joint or control. This makes it cheap to stamp the same rig onto
+hundreds of crowd characters.
+
+The file starts with a small JSON header holding the names and the table
+layout, followed by the tables as raw little-endian arrays aligned to 64
+bytes. read() maps the tables with np.memmap by default, so a library of
+large rigs can be opened without reading it into memory:
+
+    export_rig(plan, 'bob.rig')
+    rig = read('bob.rig')
+    for i in range(100):
+        load_rig(rig, prefix='crowd%03d' % i, offset=(i * 20.0, 0, 0))
+
+Every table is ordered with parents first. Joint and control transforms are
+stored local to their parent, so moving an instance only moves its top
+groups.
+'''
+import json
+import struct
+
+import numpy as np
+
+from . import controlShapes, orient
+from .backend import cmds
+from .rigPlan import RigPlan
+from .skeletonTemplate import SkeletonTemplate
+
+MAGIC = b'ARIG'
+VERSION = 1
+ALIGN = 64
+_PREAMBLE = struct.Struct('<4sII')     # magic, version, header length
+
+# Table name -> dtype. Rows of the joint tables follow meta['joints'], rows
+# of the control tables follow meta['controls']
+TABLES = {
+    'joint_parent': '<i4',      # index of the parent joint, -1 under jnt_grp
+    'joint_translate': '<f8',   # (n, 3) local translation
+    'joint_orient': '<f8',      # (n, 3) jointOrient in degrees, rotate is zero
+    'joint_radius': '<f8',
+    'control_parent': '<i4',    # index of the parent control, -1 at the top
+    'control_joint': '<i4',     # index of the joint it drives, -1 for none
+    'control_matrix': '<f8',    # (m, 4, 4) rest matrix local to the parent control
+    'control_colour': '<i4',    # overrideColor, -1 when not overridden
+    'control_limits': '<u1',    # 1 for controls with locked scale and translation
+    'shape_degree': '<i4',
+    'shape_periodic': '<u1',
+    'shape_start': '<i4',       # (m + 1,) range of each control's CVs in shape_cvs
+    'shape_cvs': '<f8',         # (k, 3) CVs in the control's space
+    'skin_joint': '<i4',        # joint of each mesh in meta['meshes']
+}
+
+
+class RigDefinition:
+    '''The names and array tables of a rig file'''
+    def __init__(self, meta, tables):
+        self.meta = meta
+        self.tables = tables
+
+    def __getitem__(self, name):
+        return self.tables[name]
+
+    def renamer(self, prefix=None):
+        '''Maps the stored names to the names of an instance with the given
+        character prefix or namespace. Each name loses the stored character's
+        scope, Bob_ or crowd01:, and is scoped again like RigPlan names its
+        nodes, so a rig moves between prefixes and namespaces either way.
+        Without a prefix the instance keeps the stored character's'''
+        character = self.meta['character']
+        prefix = prefix or character
+        if not prefix:
+            return lambda name: name
+        stored = RigPlan([], prefix=character).scoped('') if character else None
+        scope = RigPlan([], prefix=prefix).scoped
+        def rename(name):
+            if stored and name.startswith(stored):
+                name = name[len(stored):]
+            return scope(name)
+        return rename
+
+
+def _aligned(size):
+    return -(-size // ALIGN) * ALIGN
+
+
+def write(rig, path):
+    '''Writes a RigDefinition to path'''
+    layout = {}
+    arrays = []
+    offset = 0
+    for name, dtype in TABLES.items():
+        array = np.ascontiguousarray(rig.tables[name], dtype=dtype)
+        layout[name] = {'dtype': dtype, 'shape': list(array.shape), 'offset': offset}
+        arrays.append(array)
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps({'meta': rig.meta, 'tables': layout}, sort_keys=True).encode('utf-8')
+    start = _aligned(_PREAMBLE.size + len(header))
+    with open(path, 'wb') as handle:
+        handle.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        handle.write(header)
+        for name, array in zip(layout, arrays):
+            handle.seek(start + layout[name]['offset'])
+            handle.write(array.tobytes())
+        handle.truncate(start + offset)
+
+
+def read(path, mmap=True):
+    '''Reads a rig file. With mmap the tables are memory-mapped read-only
+    views of the file instead of arrays read into memory'''
+    with open(path, 'rb') as handle:
+        magic, version, length = _PREAMBLE.unpack(handle.read(_PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError("%s is not a rig file" % path)
+        if version != VERSION:
+            raise ValueError("%s is a version %d rig file, expected version %d" % (path, version, VERSION))
+        header = json.loads(handle.read(length).decode('utf-8'))
+        start = _aligned(_PREAMBLE.size + length)
+        tables = {}
+        for name, entry in header['tables'].items():
+            shape = tuple(entry['shape'])
+            count = int(np.prod(shape))
+            if not count:
+                tables[name] = np.zeros(shape, dtype=entry['dtype'])
+            elif mmap:
+                tables[name] = np.memmap(path, dtype=entry['dtype'], mode='r', offset=start + entry['offset'],
+                    shape=shape)
+            else:
+                handle.seek(start + entry['offset'])
+                tables[name] = np.fromfile(handle, dtype=entry['dtype'], count=count).reshape(shape)
+    return RigDefinition(header['meta'], tables)
+
+
+def _world_matrix(node):
+    return np.array(cmds.xform(node, q=True, matrix=True, worldSpace=True), dtype=float).reshape(4, 4)
+
+
+def _shape(ctrl):
+    '''(degree, periodic, cvs, colour) of a control's curve'''
+    shape = cmds.listRelatives(ctrl, shapes=True)[0]
+    degree = cmds.getAttr(shape + '.degree')
+    periodic = cmds.getAttr(shape + '.form') == 2
+    cvs = cmds.getAttr(shape + '.cv[*]')
+    if periodic:
+        # Periodic curves repeat their first degree CVs at the end
+        cvs = cvs[:cmds.getAttr(shape + '.spans')]
+    colour = -1
+    for node in (shape, ctrl):
+        if cmds.getAttr(node + '.overrideEnabled'):
+            colour = cmds.getAttr(node + '.overrideColor')
+            break
+    return degree, periodic, cvs, colour
+
+
+def export_rig(plan, path=None, options=None):
+    '''Reads the finished rig of a plan into a RigDefinition and writes it to
+    path if given. options are the build options stored with the rig, taken
+    from its fingerprint when left out'''
+    from . import incremental
+    if options is None:
+        data = incremental.stored(plan)
+        options = data['options'] if data else {'matrix_rig': not cmds.objExists(plan.ctrl_grp)}
+
+    from .autoRigger import JointHierarchy
+    joints, parents, modes = JointHierarchy(plan).skeleton()
+    joint_index = {joint: i for i, joint in enumerate(joints)}
+    world = np.array([_world_matrix(joint) for joint in joints]).reshape(-1, 4, 4)
+    joint_parent = np.array([joint_index.get(parents.get(joint), -1) for joint in joints])
+    local = _local(world, joint_parent)
+
+    # Controls in parent first order: main_ctrl, offset_ctrl, then the parts
+    controls = [plan.main_ctrl, plan.offset_ctrl] + list(plan.controls)
+    offsets = [plan.ctrl_grp, plan.offset_grp] + [plan.offsets[ctrl] for ctrl in plan.controls]
+    control_index = {ctrl: i for i, ctrl in enumerate(controls)}
+    control_parent = [-1, 0] + [control_index.get(plan.control_parents.get(plan.offsets[ctrl]), -1)
+        for ctrl in plan.controls]
+    drives = dict(plan.controls)
+    drives[plan.offset_ctrl] = plan.root
+    control_world = np.array([_world_matrix(ctrl) for ctrl in controls])
+    shapes = [_shape(ctrl) for ctrl in controls]
+    start = np.cumsum([0] + [len(cvs) for degree, periodic, cvs, colour in shapes])
+
+    meshes = list(plan.skin)
+    meta = {
+        # The character prefix the names start with, and the plan's own prefix
+        'character': next(iter(plan.prefixes), None) if plan.prefix is None else plan.prefix,
+        'prefix': plan.prefix,
+        'options': options,
+        'joints': joints,
+        'controls': controls,
+        'offsets': offsets,
+        'meshes': meshes,
+        'groups': {'jnt_grp': plan.jnt_grp},
+    }
+    tables = {
+        'joint_parent': joint_parent,
+        'joint_translate': local[:, 3, :3],
+        'joint_orient': orient.euler_xyz(local[:, :3, :3]),
+        'joint_radius': [cmds.getAttr(joint + '.radius') for joint in joints],
+        'control_parent': control_parent,
+        'control_joint': [joint_index.get(drives.get(ctrl), -1) for ctrl in controls],
+        'control_matrix': _local(control_world, np.array(control_parent)),
+        'control_colour': [colour for degree, periodic, cvs, colour in shapes],
+        'control_limits': [ctrl in plan.controls for ctrl in controls],
+        'shape_degree': [degree for degree, periodic, cvs, colour in shapes],
+        'shape_periodic': [periodic for degree, periodic, cvs, colour in shapes],
+        'shape_start': start,
+        'shape_cvs': np.array([cv for degree, periodic, cvs, colour in shapes for cv in cvs],
+            dtype=float).reshape(-1, 3),
+        'skin_joint': [joint_index[plan.skin[mesh]] for mesh in meshes],
+    }
+    rig = RigDefinition(meta, {name: np.asarray(value) for name, value in tables.items()})
+    if path:
+        write(rig, path)
+    return rig
+
+
+def _local(world, parent_index):
+    '''Matrices relative to their parent row, world ones where there is none'''
+    world = np.asarray(world, dtype=float).reshape(-1, 4, 4)
+    parent_world = np.where((parent_index >= 0)[:, None, None], world[parent_index], np.eye(4))
+    return world @ np.linalg.inv(parent_world)
+
+
+def load_rig(source, prefix=None, offset=None, skin=True, fast=False):
+    '''Builds a rig from a rig file or RigDefinition. prefix renames the rig
+    for another character and offset moves it in world space. With skin the
+    instance's meshes found in the scene are bound to their joints. The load
+    is one undo chunk, or runs with undo suspended with fast, as build_rig.
+    Raises RigError when any of the instance's joints, controls or groups
+    already exist. Returns the RigPlan of the instance'''
+    from .autoRigger import build_scope
+    rig = source if isinstance(source, RigDefinition) else read(source)
+    with build_scope(fast):
+        return _build(rig, prefix, offset, skin)
+
+
+def _build(rig, prefix, offset, skin):
+    meta = rig.meta
+    rename = rig.renamer(prefix)
+    move = np.eye(4)
+    if offset is not None:
+        move[3, :3] = offset
+    matrix_rig = meta['options'].get('matrix_rig')
+
+    joints = [rename(name) for name in meta['joints']]
+    controls = [rename(name) for name in meta['controls']]
+    offsets = [rename(name) for name in meta['offsets']]
+    jnt_grp = rename(meta['groups']['jnt_grp'])
+    existing = cmds.ls([jnt_grp] + joints + controls + ([] if matrix_rig else offsets))
+    if existing:
+        from .autoRigger import RigError
+        raise RigError("The rig already exists in the scene (%s). Please remove it to load it again."
+            % ", ".join(existing[:3]))
+
+    jnt_grp = cmds.createNode('transform', n=jnt_grp, skipSelect=True)
+    if offset is not None:
+        cmds.setAttr(jnt_grp + '.translate', *move[3, :3].tolist())
+    joint_parent = rig['joint_parent'].tolist()
+    translate = rig['joint_translate'].tolist()
+    joint_orient = rig['joint_orient']
+    oriented = np.abs(joint_orient).max(axis=1) > 1e-9
+    radius = rig['joint_radius'].tolist()
+    for i, joint in enumerate(joints):
+        parent = joints[joint_parent[i]] if joint_parent[i] >= 0 else jnt_grp
+        # Keep the names Maya gives the nodes, whatever was asked for
+        joint = cmds.createNode('joint', n=joint, p=parent, skipSelect=True)
+        joints[i] = joint
+        cmds.setAttr(joint + '.translate', *translate[i])
+        if oriented[i]:
+            cmds.setAttr(joint + '.jointOrient', *joint_orient[i].tolist())
+        if radius[i] != 1.0:
+            cmds.setAttr(joint + '.radius', radius[i])
+
+    control_parent = rig['control_parent'].tolist()
+    control_joint = rig['control_joint'].tolist()
+    matrices = np.array(rig['control_matrix'])
+    top = np.array(control_parent) < 0
+    matrices[top] = matrices[top] @ move
+    colours = rig['control_colour'].tolist()
+    limits = rig['control_limits'].tolist()
+    degrees = rig['shape_degree'].tolist()
+    periodic = rig['shape_periodic'].tolist()
+    start = rig['shape_start'].tolist()
+    cvs = rig['shape_cvs']
+    for i, ctrl in enumerate(controls):
+        parent = controls[control_parent[i]] if control_parent[i] >= 0 else None
+        ctrl = controlShapes.create_curve(ctrl, degrees[i], periodic[i], cvs[start[i]:start[i + 1]],
+            colour=colours[i] if colours[i] >= 0 else None, limits=limits[i])
+        controls[i] = ctrl
+        if matrix_rig:
+            if parent:
+                cmds.parent(ctrl, parent, relative=True)
+            cmds.setAttr(ctrl + '.offsetParentMatrix', *matrices[i].ravel().tolist(), type='matrix')
+        else:
+            group = cmds.createNode('transform', n=offsets[i], skipSelect=True, **({'p': parent} if parent else {}))
+            cmds.xform(group, matrix=matrices[i].ravel().tolist())
+            cmds.parent(ctrl, group, relative=True)
+    controlShapes.lock_translation([ctrl for ctrl, locked in zip(controls, limits) if locked])
+
+    for i, ctrl in enumerate(controls):
+        if control_joint[i] < 0:
+            continue
+        joint = joints[control_joint[i]]
+        if matrix_rig:
+            parent = joints[joint_parent[control_joint[i]]] if joint_parent[control_joint[i]] >= 0 else jnt_grp
+            mult = cmds.createNode('multMatrix', n=ctrl.replace('_ctrl', '') + '_multMatrix')
+            cmds.connectAttr(ctrl + '.worldMatrix[0]', mult + '.matrixIn[0]')
+            cmds.connectAttr(parent + '.worldInverseMatrix[0]', mult + '.matrixIn[1]')
+            cmds.connectAttr(mult + '.matrixSum', joint + '.offsetParentMatrix')
+            cmds.setAttr(joint + '.translate', 0, 0, 0)
+            cmds.setAttr(joint + '.jointOrient', 0, 0, 0)
+        else:
+            cmds.parentConstraint(ctrl, joint, mo=False)
+
+    meshes = [rename(name) for name in meta['meshes']]
+    template = SkeletonTemplate.from_spec(meta['options'].get('skeleton'))
+    plan = RigPlan(meshes, prefix=prefix or meta['prefix'], template=template)
+    if skin and meshes:
+        from . import incremental
+        from .autoRigger import SkinningRig
+        skinningRig = SkinningRig(plan)
+        skin_joint = rig['skin_joint'].tolist()
+        present = set(cmds.ls(meshes))
+        for mesh, joint in zip(meshes, skin_joint):
+            if mesh in present:
+                skinningRig.bind(mesh, joints[joint])
+        # With its fingerprint the instance can be updated by build_rig like any other rig
+        options = dict(incremental.DEFAULTS, **meta['options'])
+        if len(present) == len(meshes) and set(incremental.OPTIONS) <= set(options):
+            incremental.store(plan, options)
+    return plan
@@ -0,0 +1,193 @@
+'''Planning stage for the auto rigger.
+
+Reads the body meshes once and resolves every naming pattern the build
+stages need into plain lookup tables (mesh to role, role to joint, joint to
+parent, control to parent), so the stages never have to search the scene
+with wildcard queries. The plan only works on names, so it can be built and
+inspected without Maya. The body parts come from a skeleton template, the
+stock 22 part biped unless another one is given.
+
+A scene can hold several characters, told apart by their prefix and/or
+namespace (Bob_Pelvis, Ann_Pelvis, crowd01:Pelvis). character_plans() splits
+the meshes into one plan per character, and each plan then only knows the
+names of its own character. The nodes a rig has one of (root_jnt, jnt_grp,
+main_ctrl...) are always scoped by the character, as Bob_root_jnt or
+crowd01:root_jnt, so rigging one character never finds another's rig.
+'''
+
+from .skeletonTemplate import STOCK
+
+
+def character_key(name, template=STOCK):
+    '''The character a mesh belongs to: its prefix, or for meshes that don't
+    follow the convention the namespace or first name token'''
+    found = template.find_role(name)
+    if found is not None:
+        return found[0]
+    short_name = name.split('|')[-1]
+    namespace, _, base_name = short_name.rpartition(':')
+    return namespace + ':' if namespace else base_name.split('_')[0]
+
+
+def character_plans(meshes, template=STOCK):
+    '''One RigPlan per character among the meshes, in the order the
+    characters first appear. Meshes that don't follow the naming convention
+    go with the character they seem to belong to, or with the first one'''
+    characters = {}
+    strays = []
+    for mesh in meshes:
+        found = template.find_role(mesh)
+        if found is None:
+            strays.append(mesh)
+        else:
+            characters.setdefault(found[0], []).append(mesh)
+    if not characters:
+        return [RigPlan(strays, template=template)]
+    for mesh in strays:
+        key = character_key(mesh, template)
+        characters.get(key, characters[next(iter(characters))]).append(mesh)
+    return [RigPlan(character, prefix=key, template=template) for key, character in characters.items()]
+
+
+class RigPlan:
+    '''Indexed description of the rig to build for a set of body meshes.
+    prefix scopes the rig's own nodes, and defaults to the character prefix
+    the meshes share'''
+    def __init__(self, meshes, prefix=None, template=STOCK):
+        self.template = template
+        self.all_meshes = list(meshes)
+        self.meshes = {}            # mesh -> role
+        self.parts = {}             # role -> mesh
+        self.invalid = []           # meshes that don't follow the naming convention
+        self.prefixes = set()
+        for mesh in self.all_meshes:
+            found = template.find_role(mesh)
+            if found is None or found[1] in self.parts:
+                self.invalid.append(mesh)
+                continue
+            prefix, role = found
+            self.prefixes.add(prefix)
+            self.meshes[mesh] = role
+            self.parts[role] = mesh
+
+        if prefix is None and len(self.prefixes) == 1:
+            prefix = next(iter(self.prefixes))
+        self.prefix = prefix
+        self.root = self.scoped('root_jnt')
+        self.jnt_grp = self.scoped('jnt_grp')
+        self.geo_grp = self.scoped('geo_grp')
+        self.main_ctrl = self.scoped('main_ctrl')
+        self.offset_ctrl = self.scoped('offset_ctrl')
+        self.ctrl_grp = self.scoped('ctrl_grp')
+        self.offset_grp = self.scoped('offset_grp')
+
+        self.joints = {}            # role -> joint
+        self.feet = {}              # foot mesh -> (base joint, toe joint)
+        self.joint_parents = {}     # joint -> parent joint
+        self.controls = {}          # control -> joint
+        self.offsets = {}           # control -> offset group
+        self.control_parents = {}   # offset group -> parent control
+        self.skin = {}              # mesh -> influence joint
+        self.dropped = {}           # joint an LOD leaves out -> nearest joint that stays
+        self.missing = []           # parts without a mesh that parts with one hang under
+
+        for role, mesh in self.parts.items():
+            self.joints[role] = mesh + '_jnt'
+        for role, joint_parent, control_parent, skin_role in template.parts:
+            if role not in self.parts:
+                continue
+            mesh = self.parts[role]
+            joint = self.joints[role]
+            joint_parent = self.nearest(joint_parent)
+            self.joint_parents[joint] = self.joints[joint_parent] if joint_parent else self.root
+            if role in template.feet:
+                base, toe = mesh + 'Base_jnt', mesh + 'Toe_jnt'
+                self.feet[mesh] = (base, toe)
+                self.joint_parents[base] = joint
+            if control_parent is not None:
+                ctrl = mesh + '_ctrl'
+                self.controls[ctrl] = joint
+                self.offsets[ctrl] = mesh + '_offset'
+                control_parent = self.nearest(control_parent, column=2)
+                if control_parent in self.parts:
+                    self.control_parents[mesh + '_offset'] = self.parts[control_parent] + '_ctrl'
+                else:
+                    self.control_parents[mesh + '_offset'] = self.offset_ctrl
+            skin_role = self.nearest(skin_role)
+            self.skin[mesh] = self.joints[skin_role] if skin_role else self.root
+
+    def nearest(self, role, column=1):
+        '''The role itself if its part has a mesh, otherwise the nearest one up
+        the template's joint parents (column 1) or control parents (column
+        2) that has one, or what the chain ends in, None or 'offset'. Parts
+        skipped on the way are recorded in missing'''
+        roles = self.template.roles
+        while role in roles and role not in self.parts:
+            if role not in self.missing:
+                self.missing.append(role)
+            role = roles[role][column]
+        return role
+
+    def scoped(self, name):
+        '''Name of a node the rig has one of per character'''
+        if not self.prefix:
+            return name
+        if self.prefix.endswith(':'):
+            return self.prefix + name
+        return self.prefix + '_' + name
+
+    def belongs(self, mesh):
+        '''Whether a mesh name is one of this plan's character's, whether or
+        not it follows the naming convention'''
+        return character_key(mesh, self.template) in self.prefixes
+
+    def all_joints(self):
+        '''Every joint the plan creates, root and foot joints included'''
+        joints = [self.root] + list(self.joints.values())
+        for base, toe in self.feet.values():
+            joints += [base, toe]
+        return joints
+
+    def joint(self, role):
+        '''Returns the joint of a body part, or None if the part is missing'''
+        return self.joints.get(role)
+
+    def rotate_controls(self):
+        '''Controls whose circle should face down the joint'''
+        rotate = self.template.rotate_controls
+        return {mesh + '_ctrl' for role, mesh in self.parts.items() if role in rotate}
+
+    def extremities(self):
+        '''Returns the finger joints as (tip joints, aimed joints)'''
+        tips = [self.joints[role] for role in self.template.orient_none if role in self.joints]
+        aimed = [self.joints[role] for role in self.template.aim_from_parent if role in self.joints]
+        return tips, aimed
+
+    def describe(self):
+        '''Readable listing of the plan'''
+        lines = ["Rig plan for %d meshes (%d invalid)" % (len(self.all_meshes), len(self.invalid))]
+        if len(self.prefixes) > 1:
+            lines.append("  Warning: more than one character prefix: %s" % ", ".join(sorted(self.prefixes)))
+        lines.append("Joints:")
+        for joint, parent in self.joint_parents.items():
+            lines.append("  %s -> %s" % (joint, parent))
+        for base, toe in self.feet.values():
+            lines.append("  %s -> %s" % (toe, base))
+        lines.append("Controls:")
+        for ctrl, joint in self.controls.items():
+            parent = self.control_parents.get(self.offsets[ctrl], '-')
+            lines.append("  %s drives %s, offset under %s" % (ctrl, joint, parent))
+        for joint, survivor in self.dropped.items():
+            lines.append("  %s dropped, merged into %s" % (joint, survivor))
+        lines.append("Skinning:")
+        for mesh, joint in self.skin.items():
+            lines.append("  %s bound to %s" % (mesh, joint))
+        if self.missing:
+            lines.append("Missing parts, bridged to the nearest part present: %s" % ", ".join(self.missing))
+        if self.invalid:
+            lines.append("Invalid Mesh Names: %s" % ", ".join(self.invalid))
+        return "\n".join(lines)
+
+    def dry_run(self):
+        '''Prints what the rigger would build without touching the scene'''
+        print(self.describe())
@@ -0,0 +1,155 @@
+'''Skeleton templates.
+
+A template generates the body part table the rig plan is built from: one
+row per part, (role, joint parent, control parent, skinned to), plus the
+sets of parts with special controls or orientation. Instead of one hard
+coded biped, the spine, the fingers and the forearm twist can be chains of
+any length:
+
+    STOCK                                           # the 22 part biped
+    SkeletonTemplate(spine=6, fingers=5, finger_joints=3, twist=2)
+    SkeletonTemplate.parse('spine=6,fingers=5')     # as given on a command line
+    PRESETS['high']                                 # about 100 joints
+
+Chain segments are named after the part they extend. The first keeps the
+stock name and the next ones add a number ahead of the side, so a three
+joint index finger is made of Finger01_Left, Finger01_02_Left and
+Finger01_03_Left. Each segment is a body mesh like any other part and gets
+its own joint, control and skin binding; twist segments get no control.
+Templates only work on names, so they run without Maya.
+'''
+
+LEFT = 'Left'
+RIGHT = 'Right'
+
+SPINE = 'Midsection'
+TWIST = 'ForearmTwist'
+THUMB = 'Thumb'
+# Finger chains that keep a world orientation; the others aim away from the hand
+WORLD_FINGERS = ('Finger02',)
+
+
+def chain(base, count, side=None):
+    '''Roles of a chain of count segments: base, base_02, base_03...'''
+    names = [base] + ['%s_%02d' % (base, index) for index in range(2, count + 1)]
+    return [name + '_' + side for name in names] if side else names
+
+
+def finger_names(count):
+    '''Digits of a hand with count fingers, the thumb included, in stock order'''
+    return [THUMB] + ['Finger%02d' % index for index in range(count - 1, 0, -1)]
+
+
+class SkeletonTemplate:
+    '''Body parts of a biped whose spine, fingers and forearm twist are
+    chains of the given number of segments. fingers counts the thumb'''
+    def __init__(self, spine=1, fingers=3, finger_joints=1, twist=0):
+        if spine < 1 or fingers < 1 or finger_joints < 1 or twist < 0:
+            raise ValueError("A skeleton needs at least one spine segment, finger and finger joint")
+        self.spec = {'spine': spine, 'fingers': fingers, 'finger_joints': finger_joints, 'twist': twist}
+        self.parts = []             # (role, joint parent, control parent, skinned to)
+        self.chains = {}            # first segment role -> roles of its chain
+        self.rotate_controls = set()
+        self.orient_none = []
+        self.aim_from_parent = []
+
+        # Each spine mesh is bound to the joint below it, as in the stock biped
+        spine_roles = self.add_chain(SPINE, spine, "Pelvis", "Pelvis", rotate=True, skin_below=True)
+        self.parts.insert(0, ("Pelvis", None, "offset", "Pelvis"))
+        top = spine_roles[-1]
+        self.parts.append(("UpperTorso", top, None, top))
+        self.parts.append(("Head", "UpperTorso", top, "Head"))
+        for side in (LEFT, RIGHT):
+            self.parts.append(("Thigh_" + side, "Pelvis", "offset", "Thigh_" + side))
+            self.parts.append(("Calf_" + side, "Thigh_" + side, "Thigh_" + side, "Calf_" + side))
+            self.parts.append(("Foot_" + side, "Calf_" + side, "Calf_" + side, "Foot_" + side))
+        self.feet = ("Foot_" + LEFT, "Foot_" + RIGHT)
+        for side in (LEFT, RIGHT):
+            shoulder, forearm, hand = "Shoulder_" + side, "Forearm_" + side, "Hand_" + side
+            self.parts.append((shoulder, "UpperTorso", top, shoulder))
+            self.parts.append((forearm, shoulder, shoulder, forearm))
+            self.parts.append((hand, forearm, forearm, hand))
+            self.rotate_controls.update((shoulder, forearm, hand))
+            # After the hand, so the forearm still aims at the hand
+            if twist:
+                self.add_chain(TWIST, twist, forearm, None, side=side)
+        for side in (RIGHT, LEFT):
+            for finger in finger_names(fingers):
+                roles = self.add_chain(finger, finger_joints, "Hand_" + side, "Hand_" + side, side=side,
+                    rotate=True)
+                if finger in WORLD_FINGERS:
+                    self.orient_none += roles
+                elif finger != THUMB:
+                    self.aim_from_parent += roles
+
+        self.roles = {part[0]: part for part in self.parts}
+        self.max_tokens = max(len(role.split('_')) for role in self.roles)
+
+    def add_chain(self, base, count, joint_parent, control_parent, side=None, rotate=False, skin_below=False):
+        '''Adds the rows of a chain hanging under joint_parent and returns its
+        roles. Each segment is controlled from the one before it, or from
+        control_parent for the first; a control_parent of None leaves the
+        chain uncontrolled. With skin_below each segment's mesh is bound to
+        its parent joint instead of its own'''
+        roles = chain(base, count, side)
+        for role in roles:
+            self.parts.append((role, joint_parent, control_parent, joint_parent if skin_below else role))
+            joint_parent = role
+            if control_parent is not None:
+                control_parent = role
+        self.chains[roles[0]] = roles
+        if rotate:
+            self.rotate_controls.update(roles)
+        return roles
+
+    @classmethod
+    def parse(cls, text):
+        '''Template from a preset name or a spec such as 'spine=6,fingers=5' '''
+        if text in PRESETS:
+            return PRESETS[text]
+        spec = {}
+        for item in text.split(','):
+            key, _, value = item.partition('=')
+            if key.strip() not in ('spine', 'fingers', 'finger_joints', 'twist') or not value.strip().isdigit():
+                raise ValueError("Bad skeleton template %r, expected a preset (%s) or "
+                    "spine=N,fingers=N,finger_joints=N,twist=N" % (text, ", ".join(PRESETS)))
+            spec[key.strip()] = int(value)
+        return cls(**spec)
+
+    @classmethod
+    def from_spec(cls, spec):
+        '''Template from the spec stored with a rig, the stock one for None'''
+        return STOCK if not spec or spec == STOCK.spec else cls(**spec)
+
+    def joint_count(self):
+        '''Joints of a full character: one per part, the root and two per foot'''
+        return len(self.parts) + 1 + 2 * len(self.feet)
+
+    def find_role(self, name):
+        '''Returns the (prefix, role) of a mesh name such as Bob_Thigh_Left or
+        crowd01:Thigh_Left, or None when the name doesn't follow the naming
+        convention. A namespace is part of the prefix'''
+        short_name = name.split('|')[-1]
+        namespace, _, base_name = short_name.rpartition(':')
+        tokens = base_name.split('_')
+        # Without a namespace the name needs a prefix ahead of the role
+        required = 0 if namespace else 1
+        for count in range(min(self.max_tokens, len(tokens) - required), 0, -1):
+            role = '_'.join(tokens[-count:])
+            if role in self.roles:
+                prefix = '_'.join(tokens[:-count])
+                return (namespace + ':' + prefix if namespace else prefix), role
+        return None
+
+    def __repr__(self):
+        return 'SkeletonTemplate(%s)' % ', '.join('%s=%d' % item for item in self.spec.items())
+
+
+STOCK = SkeletonTemplate()
+
+# Joint counts include the root and foot joints
+PRESETS = {
+    'stock': STOCK,                                                             # 22 parts, 27 joints
+    'high': SkeletonTemplate(spine=10, fingers=5, finger_joints=6, twist=5),    # 95 parts, 100 joints
+    'dense': SkeletonTemplate(spine=10, fingers=10, finger_joints=10, twist=10),  # 245 parts, 250 joints
+}
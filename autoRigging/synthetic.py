@@ -0,0 +1,102 @@
+'''Synthetic characters that follow the body part naming convention, for
+running the rigger without production assets.
+
+Every function takes the cmds module to build with, so the same character
+can be made in Maya or in the fakeCmds scene.
+'''
+import math
+
+from . import skeletonTemplate
+from .skeletonTemplate import STOCK
+
+# Rough T-pose pivot of every stock body part
+BIPED_PIVOTS = {
+    "Pelvis": (0, 10, 0), "Midsection": (0, 11.5, 0), "UpperTorso": (0, 13, 0), "Head": (0, 15, 0),
+    "Thigh_Left": (1, 9.5, 0), "Calf_Left": (1, 5, 0), "Foot_Left": (1, 1, 0),
+    "Thigh_Right": (-1, 9.5, 0), "Calf_Right": (-1, 5, 0), "Foot_Right": (-1, 1, 0),
+    "Shoulder_Left": (2, 14, 0), "Forearm_Left": (4.5, 14, 0), "Hand_Left": (7, 14, 0),
+    "Shoulder_Right": (-2, 14, 0), "Forearm_Right": (-4.5, 14, 0), "Hand_Right": (-7, 14, 0),
+    "Thumb_Left": (7.5, 14, 0.5), "Finger01_Left": (8, 14, 0.2), "Finger02_Left": (8, 14, -0.2),
+    "Thumb_Right": (-7.5, 14, 0.5), "Finger01_Right": (-8, 14, 0.2), "Finger02_Right": (-8, 14, -0.2),
+}
+
+
+# Spacing of the joints along a finger, and of the fingers across the hand
+FINGER_STEP = 0.3
+FINGER_SPREAD = 0.4
+
+
+def _lerp(a, b, t):
+    return tuple(x + (y - x) * t for x, y in zip(a, b))
+
+
+def template_pivots(template=STOCK):
+    '''Role to T-pose pivot for every part of a skeleton template. Parts the
+    stock biped doesn't have are spread from their chain's start: up the
+    spine towards the upper torso, along the forearm for the twist and
+    outwards along the fingers'''
+    segments = {role: (first, index) for first, roles in template.chains.items() for index, role in enumerate(roles)}
+    pivots = {}
+    for role, joint_parent, control_parent, skin_role in template.parts:
+        if role in BIPED_PIVOTS:
+            pivots[role] = BIPED_PIVOTS[role]
+            continue
+        first, index = segments[role]
+        side = role.rpartition('_')[2]
+        sign = -1 if side == skeletonTemplate.RIGHT else 1
+        count = len(template.chains[first])
+        if first == skeletonTemplate.SPINE:
+            pivots[role] = _lerp(BIPED_PIVOTS[first], BIPED_PIVOTS["UpperTorso"], index / count)
+        elif first.startswith(skeletonTemplate.TWIST):
+            pivots[role] = _lerp(BIPED_PIVOTS["Forearm_" + side], BIPED_PIVOTS["Hand_" + side], (index + 1) / (count + 1))
+        else:
+            start = BIPED_PIVOTS.get(first)
+            if start is None:
+                # FingerNN, spread across the hand past the stock fingers
+                number = int(first.split('_')[0][len('Finger'):])
+                start = (sign * 8, 14, 0.2 - FINGER_SPREAD * (number - 1))
+            pivots[role] = (start[0] + sign * FINGER_STEP * index, start[1], start[2])
+    return pivots
+
+
+def character_pivots(prefix='char', offset=(0, 0, 0), template=STOCK):
+    '''Mesh name to world pivot for one character. A prefix ending in a
+    colon is a namespace, as in crowd01:Pelvis'''
+    scope = prefix if prefix.endswith(':') else prefix + '_'
+    return {scope + role: tuple(p + o for p, o in zip(pivot, offset))
+        for role, pivot in template_pivots(template).items()}
+
+
+def build_character(cmds, prefix='char', offset=(0, 0, 0), subdivisions=1, template=STOCK):
+    '''Creates one cube per body part of the template and returns the mesh names'''
+    meshes = []
+    for mesh, pivot in character_pivots(prefix, offset, template).items():
+        mesh = cmds.polyCube(n=mesh, sx=subdivisions, sy=subdivisions, sz=subdivisions, ch=False)[0]
+        cmds.xform(mesh, translation=pivot, worldSpace=True)
+        meshes.append(mesh)
+    cmds.select(clear=True)
+    return meshes
+
+
+def crowd_offsets(count, spacing=20.0):
+    '''Positions of count characters on a square grid, spacing apart'''
+    columns = max(1, math.ceil(math.sqrt(count)))
+    return [((index % columns) * spacing, 0, (index // columns) * spacing) for index in range(count)]
+
+
+def build_crowd(cmds, count, spacing=20.0, subdivisions=1, template=STOCK):
+    '''Creates count characters named char000, char001... on a square grid,
+    spacing apart, and returns all their mesh names'''
+    meshes = []
+    for index, offset in enumerate(crowd_offsets(count, spacing)):
+        meshes += build_character(cmds, 'char%03d' % index, offset, subdivisions, template)
+    return meshes
+
+
+def write_character(cmds, path, prefix='char', subdivisions=1, template=STOCK):
+    '''Saves a scene holding a single synthetic character'''
+    cmds.file(new=True, force=True)
+    build_character(cmds, prefix, subdivisions=subdivisions, template=template)
+    cmds.file(rename=path)
+    cmds.file(save=True, type='mayaAscii', force=True)
+    return path
@@ -0,0 +1,66 @@
+'''Bulk zeroing.
+
+Puts every object under a new offset group (or locator) that takes over its
+world placement, so the object's own channels read zero. The classic recipe
+takes four DAG edits per object: parent a group under it, makeIdentity,
+parent the group back to the world and parent the object under the group.
+Here all world matrices are read in one query, each offset node's transform
+is computed with NumPy and set as it is created, already under its final
+parent. Each object then takes one relative parent, and a single xform
+resets all their channels, rotateAxis included. Joints also get their
+jointOrient zeroed, since the offset node holds it now. Everything goes
+into one undo chunk.
+
+    groups = zero(controls)                                 # ctrl -> ctrl_offset
+    groups = zero(controls, parents={'Head_ctrl': 'Midsection_ctrl'})
+    locators = zero(props, names={'box': 'box_loc'}, locators=True)
+'''
+import numpy as np
+
+from .backend import cmds
+
+SUFFIX = '_offset'
+LOCATOR_SCALE = 0.001   # localScale of the locators, small enough to stay out of the way
+
+
+def zero(objects, names=None, parents=None, locators=False):
+    '''Puts each object under a new node holding its world placement and
+    returns the new nodes in the order of objects. names maps an object to
+    the name of its node (object + SUFFIX by default) and parents maps it to
+    the node its new node goes under (the world by default). With locators
+    the new nodes are locators instead of empty groups'''
+    objects = list(objects)
+    if not objects:
+        return []
+    names = names or {}
+    parents = parents or {}
+    # Parents outside the batch are read in the same query
+    outside = [parent for parent in dict.fromkeys(parents.values()) if parent and parent not in objects]
+    queried = objects + outside
+    index = {node: i for i, node in enumerate(queried)}
+    world = np.array(cmds.xform(queried, query=True, matrix=True, worldSpace=True), dtype=float).reshape(-1, 4, 4)
+    parent_world = np.array([world[index[parents[obj]]] if parents.get(obj) else np.eye(4) for obj in objects])
+    local = world[:len(objects)] @ np.linalg.inv(parent_world)
+
+    cmds.undoInfo(openChunk=True)
+    try:
+        nodes = []
+        for obj, matrix in zip(objects, local):
+            name = names.get(obj) or obj + SUFFIX
+            parent = parents.get(obj)
+            if locators:
+                node = cmds.spaceLocator(n=name)[0]
+                cmds.setAttr(node + 'Shape.localScale', LOCATOR_SCALE, LOCATOR_SCALE, LOCATOR_SCALE)
+                if parent:
+                    cmds.parent(node, parent, relative=True)
+            else:
+                node = cmds.createNode('transform', n=name, skipSelect=True, **({'p': parent} if parent else {}))
+            cmds.xform(node, matrix=matrix.ravel().tolist())
+            cmds.parent(obj, node, relative=True)
+            nodes.append(node)
+        cmds.xform(objects, translation=(0, 0, 0), rotation=(0, 0, 0), scale=(1, 1, 1), rotateAxis=(0, 0, 0))
+        for joint in cmds.ls(objects, type='joint'):
+            cmds.setAttr(joint + '.jointOrient', 0, 0, 0)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return nodes
@@ -0,0 +1,93 @@
+'''Per-control cost of creating controls, before and after the shape library.
+
+'legacy' replays the sequence ControlRig used for every control (circle,
+orientConstraint, two bakePartialHistory, makeIdentity, transformLimits and
+a listRelatives plus two setAttr for the colour). 'stamped' creates the same
+controls from a cached controlShapes template. Both place a control on each
+of a row of rotated joints and report time, cmds calls and nodes per control:
+
+    python benchmarks/benchControls.py --controls 100 1000
+    mayapy benchmarks/benchControls.py --backend maya --controls 100 1000
+'''
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from autoRigging import controlShapes
+from autoRigging.backend import cmds
+from autoRigging.profiler import RigProfiler
+
+from benchRig import start_backend
+
+MODES = ('legacy', 'stamped')
+
+
+def make_joints(count):
+    '''A row of joints, each turned a little more than the last'''
+    joints = []
+    for i in range(count):
+        joint = cmds.createNode('joint', n='bench%04d_jnt' % i)
+        cmds.setAttr(joint + '.translate', i * 0.5, 1.0, 0.0)
+        cmds.setAttr(joint + '.jointOrient', 0.0, 0.0, i % 90)
+        joints.append(joint)
+    return joints
+
+
+def legacy_control(ctrl, joint):
+    joint_translate = cmds.xform(joint, query=True, translation=True, worldSpace=True)
+    circle = cmds.circle(nr=(0, 1, 0), c=(0, 0, 0), r=0.2, n=ctrl)
+    cmds.xform(circle, translation=joint_translate, worldSpace=True)
+    cmds.delete(cmds.orientConstraint(joint, circle, mo=False))
+    cmds.bakePartialHistory(circle, query=True, prePostDeformers=True)
+    cmds.bakePartialHistory(circle, prePostDeformers=True)
+    cmds.makeIdentity(apply=True, translate=True)
+    cmds.transformLimits(sx=(1, 1), sy=(1, 1), sz=(1, 1), esx=(True, True), esy=(True, True), esz=(True, True))
+    shape = cmds.listRelatives(ctrl, shapes=True)[0]
+    cmds.setAttr(shape + '.overrideEnabled', 1)
+    cmds.setAttr(shape + '.overrideColor', 13)
+
+
+def stamped_controls(joints):
+    matrices = cmds.xform(joints, query=True, matrix=True, worldSpace=True)
+    for i, joint in enumerate(joints):
+        controlShapes.stamp(joint.replace('_jnt', '_ctrl'), radius=0.2, colour=13,
+            matrix=matrices[16 * i:16 * i + 16], limits=True)
+
+
+def run_case(mode, count):
+    cmds.file(new=True, force=True)
+    joints = make_joints(count)
+    # Templates are built once per session; start each case cold so it pays for it
+    controlShapes.clear_cache()
+    profiler = RigProfiler()
+    with profiler.stage(mode):
+        if mode == 'legacy':
+            for joint in joints:
+                legacy_control(joint.replace('_jnt', '_ctrl'), joint)
+        else:
+            stamped_controls(joints)
+    entry = profiler.to_dict()['stages'][mode]
+    return entry['seconds'], entry['total_calls'], entry['nodes_created']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-control creation cost.')
+    parser.add_argument('--backend', choices=('fake', 'maya'), default='fake')
+    parser.add_argument('--controls', type=int, nargs='+', default=[100, 1000])
+    args = parser.parse_args()
+
+    start_backend(args.backend)
+    print(f"{'mode':<10}{'controls':>10}{'seconds':>10}{'us/ctrl':>10}{'calls/ctrl':>12}{'nodes/ctrl':>12}")
+    for count in args.controls:
+        for mode in MODES:
+            seconds, calls, nodes = run_case(mode, count)
+            print(f"{mode:<10}{count:>10}{seconds:>10.4f}{seconds / count * 1e6:>10.1f}"
+                f"{calls / count:>12.2f}{nodes / count:>12.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
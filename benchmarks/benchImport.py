@@ -0,0 +1,77 @@
+'''Measures how quickly a worker can load the rigger and reuse it.
+
+Cold import times are taken in fresh interpreters, the build times in one
+long-lived process against the fake backend, so it runs with plain python:
+    python benchmarks/benchImport.py [--repeat 10] [--builds 20]
+Under mayapy it also reports the cost of importing maya.cmds, which every
+script used to pay at import before the package made it lazy.
+'''
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TIMER = 'import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)'
+
+
+def cold_import(statement, repeat):
+    '''Median time of a statement run first thing in a fresh interpreter'''
+    times = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', TIMER.format(statement=statement)],
+            cwd=ROOT, stderr=subprocess.DEVNULL)
+        times.append(float(output.decode().strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def warm_builds(builds):
+    '''Times repeated full builds in this process against the fake backend'''
+    from autoRigging import backend, synthetic
+    from autoRigging.autoRigger import build_rig
+
+    fake = backend.use_fake()
+    times = []
+    for _ in range(builds):
+        fake.file(new=True, force=True)
+        meshes = synthetic.build_character(fake)
+        start = time.perf_counter()
+        build_rig(meshes, interactive=False)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Package startup benchmark.')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--builds', type=int, default=20)
+    args = parser.parse_args()
+
+    rows = [
+        ('import autoRigging', cold_import('import autoRigging', args.repeat)),
+        ('import autoRigging.autoRigger', cold_import('import autoRigging.autoRigger', args.repeat)),
+    ]
+    try:
+        rows.append(('import maya.cmds', cold_import('import maya.standalone; import maya.cmds', args.repeat)))
+    except subprocess.CalledProcessError:
+        pass
+    for label, seconds in rows:
+        print(f"{label:<34}{seconds * 1000:>10.2f} ms")
+
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        times = warm_builds(args.builds)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    print(f"{'first build in worker':<34}{times[0] * 1000:>10.2f} ms")
+    print(f"{'later builds (median)':<34}{statistics.median(times[1:] or times) * 1000:>10.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
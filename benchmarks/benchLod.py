@@ -0,0 +1,63 @@
+'''Per-LOD budget of a rigged character.
+
+Builds one synthetic character at every LOD preset and reports the joints,
+controls, deformers and rigging DG nodes of its rig, as counted by
+lod.counts() and as created in the scene, with the build's time and cmds
+calls. --agents scales the node counts up to a crowd:
+
+    python benchmarks/benchLod.py
+    python benchmarks/benchLod.py --skeletons stock high --matrix --agents 500
+    mayapy benchmarks/benchLod.py --backend maya
+'''
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from autoRigging import lod, synthetic
+from autoRigging.autoRigger import build_characters
+from autoRigging.profiler import RigProfiler
+from autoRigging.skeletonTemplate import SkeletonTemplate
+
+from benchRig import start_backend
+
+
+def run_case(cmds, template, name, matrix_rig):
+    cmds.file(new=True, force=True)
+    meshes = synthetic.build_character(cmds, 'agent', template=template)
+    profiler = RigProfiler()
+    with contextlib.redirect_stdout(io.StringIO()):
+        plan = build_characters(meshes, interactive=False, matrix_rig=matrix_rig, skeleton=template, lod=name,
+            profiler=profiler)[0]
+    total = profiler.to_dict()['total']
+    return lod.counts(plan, matrix_rig=matrix_rig), total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Joints, deformers and DG nodes per LOD.')
+    parser.add_argument('--backend', choices=('fake', 'maya'), default='fake')
+    parser.add_argument('--skeletons', nargs='+', default=['stock'], help='skeleton templates, presets or specs')
+    parser.add_argument('--matrix', action='store_true', help='build the constraint-free matrix rig')
+    parser.add_argument('--agents', type=int, default=1, help='scale the node counts to this many agents')
+    args = parser.parse_args()
+
+    cmds = start_backend(args.backend)
+    print(f"{'skeleton':<10}{'lod':<6}{'joints':>8}{'controls':>10}{'deformers':>11}{'dg nodes':>10}"
+        f"{'created':>9}{'calls':>8}{'seconds':>9}")
+    for skeleton in args.skeletons:
+        template = SkeletonTemplate.parse(skeleton)
+        for name in lod.LODS:
+            counts, total = run_case(cmds, template, name, args.matrix)
+            scaled = {key: value * args.agents for key, value in counts.items()}
+            print(f"{skeleton:<10}{name:<6}{scaled['joints']:>8}{scaled['controls']:>10}{scaled['deformers']:>11}"
+                f"{scaled['dg nodes']:>10}{total['nodes_created'] * args.agents:>9}{total['total_calls']:>8}"
+                f"{total['seconds']:>9.4f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
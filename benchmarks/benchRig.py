@@ -0,0 +1,227 @@
+'''Benchmark harness for the whole rigger.
+
+Generates synthetic characters, rigs them with a RigProfiler attached and
+reports time, cmds calls and created nodes per stage for every case. A
+crowd case puts every character in one scene and rigs them in one
+build_characters() pass, a separate case rigs each one in its own scene and
+an instanced case rigs one character, exports it with rigFile and loads it
+back for every character of a crowd scene. --skeletons picks the skeleton
+templates the characters are made from, by preset (stock, high, dense) or
+spec such as spine=6,fingers=5, and --placement and --mirror how the joints
+are placed. With --modes constraint matrix the DG nodes the matrix rig
+saves are measured from both builds. Builds are fresh, so they skip the
+fingerprint incremental rebuilds need unless --incremental is given. On the
+fake backend the undo queue entries a case leaves behind are counted too;
+--fast builds with undo suspended, as batch jobs do.
+Runs against the in-memory fake scene by default, or Maya under mayapy:
+
+    python benchmarks/benchRig.py --characters 1 10 100 --save results/today.json
+    python benchmarks/benchRig.py --characters 10 100 --layouts crowd separate
+    python benchmarks/benchRig.py --compare results/today.json
+    python benchmarks/benchRig.py --characters 10 --fast
+    python benchmarks/benchRig.py --characters 1 10 --skeletons stock high dense
+    python benchmarks/benchRig.py --characters 10 --subdivisions 20 --placement bbox --mirror
+    mayapy benchmarks/benchRig.py --backend maya --characters 1 10
+
+Results are stored as JSON so later runs can be compared: any increase in
+calls or nodes, or a slowdown beyond --threshold, is flagged as a regression
+and makes the script exit with status 1.
+'''
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from autoRigging import backend, placement, rigFile, synthetic
+from autoRigging.skeletonTemplate import SkeletonTemplate
+from autoRigging.autoRigger import build_characters
+from autoRigging.profiler import RigProfiler
+
+STAGES = ('fingerprint', 'skeleton', 'hierarchy', 'controllers', 'offsets', 'skinning', 'load')
+LAYOUTS = ('crowd', 'separate', 'instanced')
+
+
+def start_backend(name):
+    if name == 'fake':
+        return backend.use_fake()
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+    return backend.current()
+
+
+def undo_entries():
+    '''Undo queue entries of the scene, or None where they can't be read'''
+    undo_queue = getattr(backend.current(), 'undo_queue', None)
+    return undo_queue() if undo_queue else None
+
+
+def run_case(cmds, characters, layout, subdivisions, options):
+    '''Rigs the given number of characters and sums their profiles'''
+    totals = {stage: {'seconds': 0.0, 'calls': 0, 'nodes': 0} for stage in STAGES}
+    undo = []
+    template = options['skeleton']
+    if layout == 'instanced':
+        profilers = [load_instances(cmds, characters, subdivisions, options, undo)]
+    elif layout == 'crowd':
+        cmds.file(new=True, force=True)
+        meshes = synthetic.build_crowd(cmds, characters, subdivisions=subdivisions, template=template)
+        profilers = [rig_scene(meshes, options, undo)]
+    else:
+        profilers = []
+        for index in range(characters):
+            cmds.file(new=True, force=True)
+            meshes = synthetic.build_character(cmds, 'char%03d' % index, subdivisions=subdivisions, template=template)
+            profilers.append(rig_scene(meshes, options, undo))
+    for profiler in profilers:
+        for stage, entry in profiler.to_dict()['stages'].items():
+            if stage in totals:
+                totals[stage]['seconds'] += entry['seconds']
+                totals[stage]['calls'] += entry['total_calls']
+                totals[stage]['nodes'] += entry['nodes_created']
+    totals['total'] = {key: sum(totals[stage][key] for stage in STAGES) for key in ('seconds', 'calls', 'nodes')}
+    if None not in undo:
+        totals['total']['undo'] = sum(undo)
+    return totals
+
+
+def rig_scene(meshes, options, undo):
+    '''Rigs meshes with a profiler, adding the undo entries it left to undo'''
+    profiler = RigProfiler()
+    before = undo_entries()
+    build_characters(meshes, interactive=False, profiler=profiler, **options)
+    undo.append(None if before is None else undo_entries() - before)
+    return profiler
+
+
+def load_instances(cmds, characters, subdivisions, options, undo):
+    '''Rigs one character, then loads its rig file onto every character of
+    a crowd scene. Only the loading is profiled'''
+    path = os.path.join(tempfile.mkdtemp(), 'template.rig')
+    cmds.file(new=True, force=True)
+    template = options['skeleton']
+    meshes = synthetic.build_character(cmds, 'template', subdivisions=subdivisions, template=template)
+    # The stored fingerprint carries the build options into the rig file
+    source = build_characters(meshes, interactive=False, **dict(options, incremental=True))[0]
+    rigFile.export_rig(source, path)
+    cmds.file(new=True, force=True)
+    synthetic.build_crowd(cmds, characters, subdivisions=subdivisions, template=template)
+    rig = rigFile.read(path)
+    profiler = RigProfiler()
+    before = undo_entries()
+    with profiler.stage('load'):
+        for index, offset in enumerate(synthetic.crowd_offsets(characters)):
+            rigFile.load_rig(rig, prefix='char%03d' % index, offset=offset, fast=options.get('fast', False))
+    undo.append(None if before is None else undo_entries() - before)
+    return profiler
+
+
+def run(args):
+    cmds = start_backend(args.backend)
+    cases = {}
+    skeletons = {skeleton: SkeletonTemplate.parse(skeleton) for skeleton in args.skeletons}
+    for skeleton, template in skeletons.items():
+        for mode in args.modes:
+            options = {'matrix_rig': mode == 'matrix', 'fast': args.fast, 'skeleton': template,
+                'joint_placement': args.placement, 'mirror': args.mirror, 'incremental': args.incremental}
+            for layout in args.layouts:
+                for characters in args.characters:
+                    # Stock cases keep their names so older results still compare
+                    name = '%s/%s/%d' % (mode, layout, characters)
+                    if skeleton != 'stock':
+                        name += '/' + skeleton
+                    stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+                    try:
+                        cases[name] = run_case(cmds, characters, layout, args.subdivisions, options)
+                    finally:
+                        sys.stdout.close()
+                        sys.stdout = stdout
+    return {
+        'meta': {'backend': args.backend, 'subdivisions': args.subdivisions, 'fast': args.fast,
+            'placement': args.placement, 'mirror': args.mirror, 'incremental': args.incremental,
+            'joints': {skeleton: template.joint_count() for skeleton, template in skeletons.items()}, 'python': platform.python_version(),
+            'machine': platform.node(), 'date': time.strftime('%Y-%m-%d %H:%M:%S')},
+        'cases': cases,
+    }
+
+
+def print_results(results):
+    for skeleton, joints in results['meta'].get('joints', {}).items():
+        print(f"skeleton {skeleton}: {joints} joints per character")
+    print(f"{'case':<36}{'stage':<14}{'seconds':>10}{'calls':>10}{'nodes':>10}{'undo':>10}")
+    for name, case in results['cases'].items():
+        for stage, entry in case.items():
+            print(f"{name:<36}{stage:<14}{entry['seconds']:>10.4f}{entry['calls']:>10}{entry['nodes']:>10}"
+                f"{entry.get('undo', ''):>10}")
+    for name, case in results['cases'].items():
+        matrix = results['cases'].get(name.replace('constraint/', 'matrix/', 1))
+        if name.startswith('constraint/') and matrix:
+            characters = int(name.split('/')[2])
+            saved = case['total']['nodes'] - matrix['total']['nodes']
+            print(f"{name[len('constraint/'):]:<36}DG nodes saved by the matrix rig: {saved}"
+                f" ({saved / characters:.1f} per character)")
+
+
+def compare(results, baseline, threshold):
+    '''Lists the regressions of results against a stored baseline'''
+    regressions = []
+    for name, case in results['cases'].items():
+        if name not in baseline['cases']:
+            continue
+        for stage, entry in case.items():
+            old = baseline['cases'][name].get(stage)
+            if old is None:
+                continue
+            for key in ('calls', 'nodes', 'undo'):
+                if key in entry and key in old and entry[key] > old[key]:
+                    regressions.append(f"{name} {stage}: {key} {old[key]} -> {entry[key]}")
+            if old['seconds'] > 0 and entry['seconds'] > old['seconds'] * (1.0 + threshold):
+                regressions.append(f"{name} {stage}: seconds {old['seconds']:.4f} -> {entry['seconds']:.4f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rigger benchmark harness.')
+    parser.add_argument('--backend', choices=('fake', 'maya'), default='fake')
+    parser.add_argument('--characters', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--subdivisions', type=int, default=1, help='polyCube subdivisions per body part')
+    parser.add_argument('--layouts', nargs='+', choices=LAYOUTS, default=['crowd'],
+        help='all characters in one scene, or one scene each')
+    parser.add_argument('--modes', nargs='+', choices=('constraint', 'matrix'), default=['constraint'])
+    parser.add_argument('--skeletons', nargs='+', default=['stock'],
+        help='skeleton templates to build, as presets (stock, high, dense) or specs like spine=6,fingers=5')
+    parser.add_argument('--placement', choices=placement.MODES, default=placement.PIVOT,
+        help='point of each mesh its joint is placed at')
+    parser.add_argument('--mirror', action='store_true', help='mirror the right side from the left when symmetric')
+    parser.add_argument('--fast', action='store_true', help='build with undo and viewport refresh suspended')
+    parser.add_argument('--incremental', action='store_true',
+        help='fingerprint and store the parts for incremental rebuilds, as build_rig does by default')
+    parser.add_argument('--save', help='store the results as JSON')
+    parser.add_argument('--compare', help='flag regressions against stored results')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown before flagging, 0.25 = 25%%')
+    args = parser.parse_args()
+
+    results = run(args)
+    print_results(results)
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w') as handle:
+            json.dump(results, handle, indent=2)
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(results, json.load(handle), args.threshold)
+        for regression in regressions:
+            print('REGRESSION', regression)
+        if regressions:
+            return 1
+        print('No regressions against', args.compare)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+'''Compares per-piece rigid skinning with the combined single skinCluster mode.
+
+Run with mayapy from the repository root:
+    mayapy benchmarks/benchSkinning.py [--subdivisions 10] [--frames 100] [--falloff 0.0]
+'''
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import maya.standalone
+maya.standalone.initialize()
+import maya.cmds as cmds
+
+from autoRigging import synthetic
+from autoRigging.autoRigger import SkinningRig
+from autoRigging.rigPlan import RigPlan
+
+
+def build_character(subdivisions):
+    '''Creates one cube per body part plus the joints the skinning stage expects'''
+    meshes = synthetic.build_character(cmds, 'bench', subdivisions=subdivisions)
+    cmds.group(meshes, n='geo_grp')
+    plan = RigPlan(meshes)
+    cmds.select(clear=True)
+    cmds.joint(n=plan.root)
+    for joint, parent in plan.joint_parents.items():
+        cmds.select(clear=True)
+        mesh = joint[:-len('_jnt')]
+        cmds.joint(n=joint, p=cmds.xform(mesh, q=True, t=True, ws=True) if mesh in plan.meshes else (0, 0, 0))
+    for joint, parent in plan.joint_parents.items():
+        cmds.parent(joint, parent)
+    return plan
+
+
+def time_evaluation(plan, frames):
+    '''Keys the joints and times the deformation over a frame range'''
+    for i, joint in enumerate(plan.joints.values()):
+        cmds.setKeyframe(joint, at='rotateZ', t=0, v=0)
+        cmds.setKeyframe(joint, at='rotateZ', t=frames, v=10 + i)
+    shapes = cmds.ls(type='mesh', ni=True)
+    start = time.perf_counter()
+    for frame in range(frames):
+        cmds.currentTime(frame, update=True)
+        for shape in shapes:
+            cmds.dgeval(shape + '.outMesh')
+    return time.perf_counter() - start
+
+
+def run(mode, subdivisions, frames, falloff):
+    cmds.file(new=True, force=True)
+    plan = build_character(subdivisions)
+    start = time.perf_counter()
+    SkinningRig(plan, combine=(mode == 'combined'), falloff=falloff, constrain=False).skin_mesh()
+    bind_time = time.perf_counter() - start
+    deformers = len(cmds.ls(type='skinCluster'))
+    eval_time = time_evaluation(plan, frames)
+    return deformers, bind_time, eval_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--subdivisions', type=int, default=10)
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--falloff', type=float, default=0.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'deformers':>10}{'bind (s)':>12}{'eval (s)':>12}")
+    for mode in ('per-piece', 'combined'):
+        deformers, bind_time, eval_time = run(mode, args.subdivisions, args.frames, args.falloff)
+        print(f"{mode:<10}{deformers:>10}{bind_time:>12.4f}{eval_time:>12.4f}")
+
+
+if __name__ == '__main__':
+    main()
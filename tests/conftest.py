@@ -0,0 +1,12 @@
+import pytest
+
+from autoRigging import backend
+
+
+@pytest.fixture
+def fake():
+    '''A new, empty fakeCmds scene for the test to run on'''
+    cmds = backend.use_fake()
+    cmds.file(new=True, force=True)
+    yield cmds
+    backend.use_maya()
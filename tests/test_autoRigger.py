@@ -0,0 +1,19 @@
+from autoRigging import synthetic
+from autoRigging.autoRigger import build_rig
+
+
+def test_build_keeps_the_selection(fake):
+    meshes = synthetic.build_character(fake, 'Bob')
+    fake.select(meshes[:2])
+    build_rig(meshes, interactive=False)
+    assert fake.ls(sl=True) == meshes[:2]
+
+
+def test_build_is_one_undo_entry(fake):
+    bob = synthetic.build_character(fake, 'Bob')
+    ann = synthetic.build_character(fake, 'Ann', offset=(20, 0, 0))
+    queued = fake.undo_queue()
+    build_rig(bob, interactive=False)
+    assert fake.undo_queue() == queued + 1
+    build_rig(ann, interactive=False, fast=True)
+    assert fake.undo_queue() == queued + 1
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from autoRigging import backend, batchRig, synthetic
+
+
+@pytest.mark.parametrize('flags', [[], ['--combine-skin'], ['--matrix-rig', '--lod', 'lod1']])
+def test_batch_on_the_fake_backend(tmp_path, flags):
+    cmds = backend.use_fake()
+    paths = []
+    for name in ('Bob', 'Ann'):
+        cmds.file(new=True, force=True)
+        synthetic.build_character(cmds, name)
+        paths.append(str(tmp_path / (name + '.json')))
+        cmds.file(rename=paths[-1])
+        cmds.file(save=True)
+    backend.use_maya()
+    manifest = tmp_path / 'manifest.txt'
+    manifest.write_text('\n'.join(paths))
+    report = tmp_path / 'report.json'
+
+    status = batchRig.main([str(manifest), '--backend', 'fake', '--workers', '2', '--output',
+        str(tmp_path / 'rigged'), '--report', str(report)] + flags)
+    results = json.loads(report.read_text())['results']
+    assert status == 0, [result['error'] for result in results]
+    assert [result['rigs'] for result in results] == [1, 1]
+
+
+def test_a_file_without_body_meshes_fails(tmp_path):
+    cmds = backend.use_fake()
+    cmds.file(new=True, force=True)
+    cmds.polyCube(n='teapot')
+    path = str(tmp_path / 'teapot.json')
+    cmds.file(rename=path)
+    cmds.file(save=True)
+    result = batchRig.rig_character(path)
+    backend.use_maya()
+    assert not result['ok'] and result['rigs'] == 0 and result['invalid'] == ['teapot']
+    assert 'RigError' in result['error']
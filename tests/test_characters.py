@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from autoRigging import synthetic
+from autoRigging.autoRigger import RigError, build_characters, build_rig
+from autoRigging.rigPlan import character_plans
+
+
+def test_rig_nodes_are_always_scoped():
+    plan, = character_plans(['Bob_Pelvis', 'Bob_Head'])
+    assert (plan.root, plan.jnt_grp, plan.main_ctrl) == ('Bob_root_jnt', 'Bob_jnt_grp', 'Bob_main_ctrl')
+    plan, = character_plans(['crowd01:Pelvis'])
+    assert plan.jnt_grp == 'crowd01:jnt_grp'
+
+
+def test_rigging_one_character_keeps_the_other(fake):
+    bob = synthetic.build_character(fake, 'Bob')
+    ann = synthetic.build_character(fake, 'Ann', offset=(20, 0, 0))
+    build_rig(bob, interactive=False)
+    build_rig(ann, interactive=False)
+    assert len(fake.ls('Bob_*', type='joint')) == len(fake.ls('Ann_*', type='joint')) == 27
+    assert len(fake.ls(type='skinCluster')) == 44
+
+
+def test_update_after_rigging_characters_together(fake):
+    bob = synthetic.build_character(fake, 'Bob')
+    ann = synthetic.build_character(fake, 'Ann', offset=(20, 0, 0))
+    build_characters(bob + ann, interactive=False)
+    fake.xform('Bob_Head', translation=(0, 15.5, 0), worldSpace=True)
+    plan = build_rig(bob, interactive=False)
+    head = fake.xform(plan.joints['Head'], q=True, translation=True, worldSpace=True)
+    np.testing.assert_allclose(head, [0, 15.5, 0], atol=1e-9)
+
+
+def test_another_characters_rig_is_never_torn_down(fake):
+    bob = synthetic.build_character(fake, 'Bob')
+    ann = synthetic.build_character(fake, 'Ann', offset=(20, 0, 0))
+    build_rig(ann, interactive=False)
+    fake.rename('Ann_jnt_grp', 'Bob_jnt_grp')
+    with pytest.raises(RigError):
+        build_rig(bob, interactive=False)
+    assert len(fake.ls('Ann_*', type='joint')) == 27
+
+
+def test_build_rig_returns_one_plan_and_refuses_several_characters(fake):
+    bob = synthetic.build_character(fake, 'Bob')
+    ann = synthetic.build_character(fake, 'Ann', offset=(20, 0, 0))
+    with pytest.raises(RigError):
+        build_rig(bob + ann, interactive=False)
+    assert not fake.ls(type='joint')
+    assert build_rig(bob, interactive=False).prefix == 'Bob'
+    assert [plan.prefix for plan in build_characters(bob + ann, interactive=False)] == ['Bob', 'Ann']
@@ -0,0 +1,42 @@
+import numpy as np
+
+from autoRigging import synthetic
+from autoRigging.combinedSkin import CombinedSkin, compute_weights, part_ids_from_counts
+from autoRigging.rigPlan import RigPlan
+
+
+def test_rigid_weights():
+    weights = compute_weights(part_ids_from_counts([2, 3]), [1, 0], 2)
+    assert weights.tolist() == [[0, 1], [0, 1], [1, 0], [1, 0], [1, 0]]
+
+
+def test_falloff_blends_both_sides_of_a_boundary():
+    # Part 0 (influence 0) is the parent of part 1 (influence 1), which meets it at x = 1
+    positions = [[0.0, 0, 0], [0.75, 0, 0], [1.0, 0, 0], [1.25, 0, 0], [2.0, 0, 0]]
+    part_ids = [0, 0, 1, 1, 1]
+    weights = compute_weights(part_ids, [0, 1], 2, positions=positions, pivots=[[0, 0, 0], [1, 0, 0]],
+        parent_influence=[-1, 0], falloff=0.5)
+    np.testing.assert_allclose(weights, [[1, 0], [0.75, 0.25], [0.5, 0.5], [0.25, 0.75], [0, 1]])
+
+
+def test_falloff_keeps_half_on_the_own_influence():
+    # Two children meet their parent at the same point
+    weights = compute_weights([0, 1, 2], [0, 1, 2], 3, positions=[[0, 0, 0]] * 3, pivots=[[0, 0, 0]] * 3,
+        parent_influence=[-1, 0, 0], falloff=1.0)
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+    np.testing.assert_allclose(weights[0], [0.5, 0.25, 0.25])
+    np.testing.assert_allclose(weights[1], [0.5, 0.5, 0.0])
+
+
+def test_combined_skin_on_the_fake_backend(fake):
+    meshes = synthetic.build_character(fake, 'Bob', subdivisions=2)
+    plan = RigPlan(meshes)
+    for joint in plan.all_joints():
+        fake.createNode('joint', name=joint)
+    vertices = sum(fake.polyEvaluate(mesh, vertex=True) for mesh in meshes)
+
+    skinCluster = CombinedSkin(plan, falloff=0.5).skin()
+    weights = np.array(list(fake.scene.nodes[skinCluster].attrs['weights'].values())).T
+    assert weights.shape[0] == vertices
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+    assert fake.ls(type='skinCluster') == [skinCluster]
@@ -0,0 +1,16 @@
+import numpy as np
+
+from autoRigging.createRigControllers import createRigControllers
+
+
+def test_controls_are_frozen_at_their_joint(fake):
+    fake.createNode('joint', name='Arm_jnt')
+    fake.xform('Arm_jnt', translation=(3, 4, 5), worldSpace=True)
+    createRigControllers(['Arm_jnt'])
+    assert fake.getAttr('Arm_ctrl.translate') == [(0.0, 0.0, 0.0)]
+    assert fake.getAttr('Arm_ctrl.rotatePivot') == [(3.0, 4.0, 5.0)]
+    # Periodic curves repeat their first CVs at the end
+    cvs = np.array(fake.getAttr('Arm_ctrlShape.cv[*]'))[:fake.getAttr('Arm_ctrlShape.spans')]
+    np.testing.assert_allclose(cvs.mean(axis=0), [3, 4, 5], atol=1e-9)
+    distances = np.linalg.norm(cvs - [3, 4, 5], axis=1)
+    np.testing.assert_allclose(distances, distances[0])
@@ -0,0 +1,46 @@
+import numpy as np
+
+from autoRigging import synthetic
+from autoRigging.autoRigger import build_characters, build_rig
+
+
+def rig(cmds, matrix_rig):
+    cmds.file(new=True, force=True)
+    plan = build_rig(synthetic.build_character(cmds, 'Bob'), interactive=False, matrix_rig=matrix_rig)
+    nodes = plan.all_joints() + list(plan.controls)
+    return plan, np.array(cmds.xform(nodes, q=True, matrix=True, worldSpace=True)).reshape(-1, 16)
+
+
+def test_matrix_rig_places_joints_like_the_constraint_rig(fake):
+    _, constraint = rig(fake, False)
+    plan, matrix = rig(fake, True)
+    np.testing.assert_allclose(matrix, constraint, atol=1e-9)
+    assert fake.ls(type='constraint') == []
+    assert len(fake.ls(type='multMatrix')) == len(plan.controls) + 1
+
+
+def test_constraint_rig_reuses_each_joints_constraint(fake):
+    plan, _ = rig(fake, False)
+    # ControlRig and SkinningRig constrain the same pairs, Maya keeps one node per joint
+    assert len(fake.ls(type='parentConstraint')) == len(plan.controls) + 1
+
+
+def test_report_counts_every_character(fake, capsys):
+    fake.file(new=True, force=True)
+    meshes = synthetic.build_crowd(fake, 2)
+    plans = build_characters(meshes, interactive=False, matrix_rig=True)
+    rows = {line.split()[0]: line.split()[1:] for line in capsys.readouterr().out.splitlines()
+        if line.split() and line.split()[0] in ('parentConstraint', 'multMatrix')}
+    driven = sum(len(plan.controls) + 1 for plan in plans)
+    assert rows['multMatrix'] == [str(driven), '%.1f' % (driven / 2)]
+    assert rows['parentConstraint'] == ['0', '0.0']
+
+
+def test_controls_drive_their_joints(fake):
+    plan, _ = rig(fake, True)
+    ctrl, joint = next((ctrl, joint) for ctrl, joint in plan.controls.items() if joint.endswith('Forearm_Left_jnt'))
+    fake.setAttr(ctrl + '.rotate', 0, 0, 30)
+    np.testing.assert_allclose(fake.xform(joint, q=True, matrix=True, worldSpace=True),
+        fake.xform(ctrl, q=True, matrix=True, worldSpace=True), atol=1e-9)
+    hand = fake.xform(plan.joints['Hand_Left'], q=True, translation=True, worldSpace=True)
+    assert hand[1] > 14.0
@@ -0,0 +1,25 @@
+from autoRigging import incremental, mirror, placement, synthetic
+from autoRigging.rigPlan import RigPlan
+
+
+def lopsided_right_hand(cmds):
+    '''Keeps the right hand's pivot, bounding box and vertex count but piles
+    its vertices into one corner, moving its centroid'''
+    shape = cmds.listRelatives('Bob_Hand_Right', shapes=True)[0]
+    cmds.scene.nodes[shape].attrs['points'] = [[-0.5] * 3] + [[0.5] * 3] * 7
+
+
+def test_sides_mirror(fake):
+    plan = RigPlan(synthetic.build_character(fake, 'Bob'))
+    parts = incremental.fingerprint(plan)
+    for mode in placement.MODES:
+        pairs, plane = mirror.symmetric(plan, parts, mode)
+        assert pairs['Bob_Hand_Right'] == 'Bob_Hand_Left' and abs(plane) < 1e-9
+
+
+def test_centroid_mode_compares_centroids(fake):
+    plan = RigPlan(synthetic.build_character(fake, 'Bob'))
+    lopsided_right_hand(fake)
+    parts = incremental.fingerprint(plan)
+    assert mirror.symmetric(plan, parts, placement.BBOX)
+    assert mirror.symmetric(plan, parts, placement.CENTROID) is None
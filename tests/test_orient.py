@@ -0,0 +1,52 @@
+import numpy as np
+
+from autoRigging import orient
+
+
+def random_rotations(count, seed=0):
+    matrices, _ = np.linalg.qr(np.random.default_rng(seed).normal(size=(count, 3, 3)))
+    # Turn reflections into rotations
+    matrices[np.linalg.det(matrices) < 0] *= -1
+    return matrices
+
+
+def test_euler_round_trip():
+    matrices = random_rotations(50)
+    np.testing.assert_allclose(orient.euler_matrices(orient.euler_xyz(matrices)), matrices, atol=1e-9)
+    angles = [[10, 20, 30], [-45, 80, 170], [0, 0, 0]]
+    np.testing.assert_allclose(orient.euler_xyz(orient.euler_matrices(angles)), angles, atol=1e-9)
+
+
+def test_euler_round_trip_in_gimbal_lock():
+    matrices = orient.euler_matrices([[30, 90, 20], [15, -90, 0]])
+    np.testing.assert_allclose(orient.euler_matrices(orient.euler_xyz(matrices)), matrices, atol=1e-9)
+
+
+def test_orient_skeleton_round_trips_through_local_transforms():
+    joints = ['root', 'hip', 'knee', 'ankle', 'spine']
+    positions = [[0, 0, 0], [1, 10, 0.5], [1.5, 5, 1], [1.5, 0.5, 0], [0, 12, 0]]
+    parents = {'hip': 'root', 'knee': 'hip', 'ankle': 'knee', 'spine': 'root'}
+    modes = {'hip': orient.AIM, 'knee': orient.AIM, 'ankle': orient.AIM, 'spine': orient.FROM_PARENT}
+    world = orient.orient_skeleton(joints, positions, parents, modes)
+
+    np.testing.assert_allclose(np.einsum('nij,nkj->nik', world, world), np.repeat(np.eye(3)[None], 5, 0), atol=1e-9)
+    np.testing.assert_allclose(np.linalg.det(world), 1.0)
+    # Aimed joints point x at their child, leaves copy their parent, spine points away from root
+    aim = np.subtract(positions[2], positions[1])
+    np.testing.assert_allclose(world[1][0], aim / np.linalg.norm(aim))
+    np.testing.assert_allclose(world[3], world[2])
+    np.testing.assert_allclose(world[4][0], [0, 1, 0])
+    np.testing.assert_allclose(world[0], np.eye(3))
+
+    # Composing the local transforms down the chain gives back the world frames
+    translate, joint_orient = orient.local_transforms(joints, positions, parents, world)
+    local = orient.euler_matrices(joint_orient)
+    index = {joint: i for i, joint in enumerate(joints)}
+    rebuilt, placed = {}, {}
+    for i, joint in enumerate(joints):
+        parent = parents.get(joint)
+        parent_world = rebuilt[parent] if parent else np.eye(3)
+        rebuilt[joint] = local[i] @ parent_world
+        placed[joint] = translate[i] @ parent_world + (placed[parent] if parent else 0.0)
+        np.testing.assert_allclose(rebuilt[joint], world[i], atol=1e-9)
+        np.testing.assert_allclose(placed[joint], positions[index[joint]], atol=1e-9)
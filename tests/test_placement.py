@@ -0,0 +1,17 @@
+import numpy as np
+
+from autoRigging import incremental, placement, synthetic
+from autoRigging.rigPlan import RigPlan
+
+
+def test_bbox_placement_is_not_rounded(fake):
+    plan = RigPlan(synthetic.build_character(fake, 'Bob'))
+    fake.xform('Bob_Head', translation=(0.123456789, 15.987654321, 0.000012345), worldSpace=True)
+    parts = incremental.fingerprint(plan)
+    box = np.array(fake.exactWorldBoundingBox('Bob_Head'))
+    np.testing.assert_allclose(placement.mesh_positions(['Bob_Head'], placement.BBOX, parts)[0],
+        (box[:3] + box[3:]) / 2, rtol=0, atol=1e-12)
+
+    # Fingerprints still compare at DIGITS decimals
+    fake.xform('Bob_Head', translation=(0.123456, 15.987654, 0.000012), worldSpace=True)
+    assert incremental.diff(parts, incremental.fingerprint(plan)) == ([], [], [])
@@ -0,0 +1,46 @@
+'''Scene calls of each build stage on the stock character. A change that
+adds scene queries to a stage fails here; lower the numbers when a change
+saves some'''
+import contextlib
+import io
+
+import pytest
+
+from autoRigging import controlShapes, incremental, synthetic
+from autoRigging.autoRigger import build_rig
+from autoRigging.profiler import RigProfiler
+
+STAGES = ('fingerprint', 'skeleton', 'hierarchy', 'controllers', 'offsets', 'skinning')
+
+
+def profile(meshes, **options):
+    profiler = RigProfiler()
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_rig(meshes, interactive=False, profiler=profiler, **options)
+    return {name: entry['total_calls'] for name, entry in profiler.to_dict()['stages'].items()}
+
+
+@pytest.mark.parametrize('options, calls', [
+    ({}, (48, 86, 49, 141, 75, 44)),
+    ({'matrix_rig': True}, (48, 86, 49, 119, 288, 23)),
+    ({'lod': 'lod1'}, (48, 86, 50, 105, 57, 38)),
+])
+def test_stage_calls(fake, options, calls):
+    meshes = synthetic.build_character(fake, 'Bob')
+    # Control shape templates are cached per session, count building them too
+    controlShapes.clear_cache()
+    assert profile(meshes, **options) == dict(zip(STAGES, calls))
+
+
+def test_unchanged_rebuild_only_compares_fingerprints(fake):
+    meshes = synthetic.build_character(fake, 'Bob')
+    profile(meshes)
+    calls = profile(meshes)
+    assert {stage: count for stage, count in calls.items() if count} == {'incremental': 47}
+
+
+def test_builds_without_incremental_skip_the_fingerprint(fake):
+    meshes = synthetic.build_character(fake, 'Bob')
+    calls = profile(meshes, incremental=False)
+    assert 'fingerprint' not in calls and calls['skeleton'] == 86
+    assert not fake.objExists('Bob_jnt_grp.' + incremental.ATTR)
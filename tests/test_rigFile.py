@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from autoRigging import rigFile, synthetic
+from autoRigging.autoRigger import RigError, build_rig
+
+
+@pytest.fixture
+def bob_rig(fake, tmp_path):
+    plan = build_rig(synthetic.build_character(fake, 'Bob'), interactive=False)
+    path = str(tmp_path / 'bob.rig')
+    rigFile.export_rig(plan, path)
+    names = plan.all_joints() + list(plan.controls)
+    world = np.array(fake.xform(names, q=True, matrix=True, worldSpace=True))
+    fake.file(new=True, force=True)
+    return rigFile.read(path), names, world
+
+
+def test_load_rebuilds_the_rig_for_another_character(fake, bob_rig):
+    rig, names, world = bob_rig
+    synthetic.build_character(fake, 'Ann')
+    plan = rigFile.load_rig(rig, prefix='Ann')
+    rename = rig.renamer('Ann')
+    np.testing.assert_allclose(fake.xform([rename(name) for name in names], q=True, matrix=True, worldSpace=True),
+        world, atol=1e-9)
+    assert plan.jnt_grp == 'Ann_jnt_grp'
+    assert len(fake.ls(type='skinCluster')) == 22
+
+
+def test_loading_onto_a_rigged_character_is_refused(fake, bob_rig):
+    rig = bob_rig[0]
+    synthetic.build_character(fake, 'Ann')
+    rigFile.load_rig(rig, prefix='Ann')
+    nodes = len(fake.ls())
+    with pytest.raises(RigError):
+        rigFile.load_rig(rig, prefix='Ann')
+    assert len(fake.ls()) == nodes
+
+
+@pytest.mark.parametrize('exported, loaded', [('Bob', 'crowd02:'), ('crowd01:', 'Ann')])
+def test_load_across_prefixes_and_namespaces(fake, tmp_path, exported, loaded):
+    plan = build_rig(synthetic.build_character(fake, exported), interactive=False)
+    path = str(tmp_path / 'exported.rig')
+    rigFile.export_rig(plan, path)
+    fake.file(new=True, force=True)
+    expected = build_rig(synthetic.build_character(fake, loaded), interactive=False, dry_run=True)
+
+    plan = rigFile.load_rig(path, prefix=loaded)
+    assert plan.jnt_grp == expected.jnt_grp and fake.ls(expected.jnt_grp)
+    assert sorted(fake.ls(type='joint')) == sorted(expected.all_joints())
+    assert len(fake.ls(type='skinCluster')) == 22
@@ -0,0 +1,61 @@
+from autoRigging import synthetic
+from autoRigging.rigPlan import RigPlan
+from autoRigging.skeletonTemplate import SkeletonTemplate
+
+
+def test_missing_segments_attach_to_the_nearest_part():
+    # Stock meshes have one Midsection, a three-segment spine expects three
+    plan = RigPlan(list(synthetic.character_pivots('Bob')), template=SkeletonTemplate(spine=3))
+    assert plan.missing == ['Midsection_03', 'Midsection_02']
+    assert plan.joint_parents[plan.joints['UpperTorso']] == plan.joints['Midsection']
+    assert plan.control_parents['Bob_Head_offset'] == 'Bob_Midsection_ctrl'
+    assert plan.skin['Bob_UpperTorso'] == plan.joints['Midsection']
+
+
+def unscoped(table):
+    return {key[len('Bob_'):]: value[len('Bob_'):] for key, value in table.items()}
+
+
+def test_stock_plan_tables():
+    plan = RigPlan(list(synthetic.character_pivots('Bob')))
+    assert len(plan.meshes) == 22 and len(plan.all_joints()) == 27 and not plan.missing
+    assert unscoped(plan.joint_parents) == {
+        'Pelvis_jnt': 'root_jnt', 'Midsection_jnt': 'Pelvis_jnt', 'UpperTorso_jnt': 'Midsection_jnt',
+        'Head_jnt': 'UpperTorso_jnt',
+        'Thigh_Left_jnt': 'Pelvis_jnt', 'Calf_Left_jnt': 'Thigh_Left_jnt', 'Foot_Left_jnt': 'Calf_Left_jnt',
+        'Foot_LeftBase_jnt': 'Foot_Left_jnt',
+        'Thigh_Right_jnt': 'Pelvis_jnt', 'Calf_Right_jnt': 'Thigh_Right_jnt', 'Foot_Right_jnt': 'Calf_Right_jnt',
+        'Foot_RightBase_jnt': 'Foot_Right_jnt',
+        'Shoulder_Left_jnt': 'UpperTorso_jnt', 'Forearm_Left_jnt': 'Shoulder_Left_jnt',
+        'Hand_Left_jnt': 'Forearm_Left_jnt', 'Thumb_Left_jnt': 'Hand_Left_jnt',
+        'Finger01_Left_jnt': 'Hand_Left_jnt', 'Finger02_Left_jnt': 'Hand_Left_jnt',
+        'Shoulder_Right_jnt': 'UpperTorso_jnt', 'Forearm_Right_jnt': 'Shoulder_Right_jnt',
+        'Hand_Right_jnt': 'Forearm_Right_jnt', 'Thumb_Right_jnt': 'Hand_Right_jnt',
+        'Finger01_Right_jnt': 'Hand_Right_jnt', 'Finger02_Right_jnt': 'Hand_Right_jnt',
+    }
+    assert unscoped(plan.control_parents) == {
+        'Pelvis_offset': 'offset_ctrl', 'Midsection_offset': 'Pelvis_ctrl', 'Head_offset': 'Midsection_ctrl',
+        'Thigh_Left_offset': 'offset_ctrl', 'Calf_Left_offset': 'Thigh_Left_ctrl',
+        'Foot_Left_offset': 'Calf_Left_ctrl',
+        'Thigh_Right_offset': 'offset_ctrl', 'Calf_Right_offset': 'Thigh_Right_ctrl',
+        'Foot_Right_offset': 'Calf_Right_ctrl',
+        'Shoulder_Left_offset': 'Midsection_ctrl', 'Forearm_Left_offset': 'Shoulder_Left_ctrl',
+        'Hand_Left_offset': 'Forearm_Left_ctrl', 'Thumb_Left_offset': 'Hand_Left_ctrl',
+        'Finger01_Left_offset': 'Hand_Left_ctrl', 'Finger02_Left_offset': 'Hand_Left_ctrl',
+        'Shoulder_Right_offset': 'Midsection_ctrl', 'Forearm_Right_offset': 'Shoulder_Right_ctrl',
+        'Hand_Right_offset': 'Forearm_Right_ctrl', 'Thumb_Right_offset': 'Hand_Right_ctrl',
+        'Finger01_Right_offset': 'Hand_Right_ctrl', 'Finger02_Right_offset': 'Hand_Right_ctrl',
+    }
+    # The spine meshes skin to the segment below, every other mesh to its own joint
+    skin = unscoped(plan.skin)
+    assert skin.pop('Midsection') == 'Pelvis_jnt' and skin.pop('UpperTorso') == 'Midsection_jnt'
+    assert all(joint == mesh + '_jnt' for mesh, joint in skin.items())
+    assert plan.controls == {mesh + '_ctrl': mesh + '_jnt' for mesh in plan.meshes if mesh != 'Bob_UpperTorso'}
+
+
+def test_dry_run_lists_the_plan(capsys):
+    RigPlan(list(synthetic.character_pivots('Bob')) + ['teapot']).dry_run()
+    out = capsys.readouterr().out
+    assert 'Rig plan for 23 meshes (1 invalid)' in out
+    assert 'Bob_Head_ctrl drives Bob_Head_jnt, offset under Bob_Midsection_ctrl' in out
+    assert 'Invalid Mesh Names: teapot' in out
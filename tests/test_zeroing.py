@@ -0,0 +1,20 @@
+import numpy as np
+
+from autoRigging import zeroing
+
+
+def test_zeroing_keeps_the_world_placement(fake):
+    fake.createNode('joint', n='arm_jnt')
+    fake.setAttr('arm_jnt.translate', 1, 2, 3)
+    fake.setAttr('arm_jnt.rotate', 0, 0, 45)
+    fake.setAttr('arm_jnt.jointOrient', 0, 0, 45)
+    fake.createNode('transform', n='hand_ctrl')
+    fake.xform('hand_ctrl', translation=(4, 2, 3), rotation=(10, 0, 0))
+    objects = ['arm_jnt', 'hand_ctrl']
+    before = fake.xform(objects, q=True, matrix=True, worldSpace=True)
+
+    assert zeroing.zero(objects, parents={'hand_ctrl': 'arm_jnt'}) == ['arm_jnt_offset', 'hand_ctrl_offset']
+    np.testing.assert_allclose(fake.xform(objects, q=True, matrix=True, worldSpace=True), before, atol=1e-9)
+    assert fake.listRelatives('hand_ctrl_offset', parent=True) == ['arm_jnt']
+    for obj in objects:
+        np.testing.assert_allclose(fake.xform(obj, q=True, matrix=True), np.eye(4).ravel(), atol=1e-9)